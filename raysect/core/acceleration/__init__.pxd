@@ -32,4 +32,5 @@
 from raysect.core.acceleration.accelerator cimport Accelerator
 from raysect.core.acceleration.unaccelerated cimport Unaccelerated
 from raysect.core.acceleration.kdtree cimport KDTree
+from raysect.core.acceleration.bvh cimport BVH
 from raysect.core.acceleration.boundprimitive cimport BoundPrimitive
@@ -32,4 +32,5 @@
 from .accelerator import Accelerator
 from .unaccelerated import Unaccelerated
 from .kdtree import KDTree
+from .bvh import BVH
 from .boundprimitive import BoundPrimitive
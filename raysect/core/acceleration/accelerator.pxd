@@ -37,6 +37,8 @@ cdef class Accelerator:
 
     cpdef build(self, list primitives)
 
+    cpdef bint update(self, list primitives) except -1
+
     cpdef Intersection hit(self, Ray ray)
 
     cpdef list contains(self, Point3D point)
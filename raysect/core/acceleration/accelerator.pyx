@@ -35,6 +35,20 @@ cdef class Accelerator:
 
         pass
 
+    cpdef bint update(self, list primitives) except -1:
+        """
+        Updates the acceleration structure following a change to the bounds of the supplied primitives.
+
+        Accelerators that support incremental updates should override this
+        method and return True if the update succeeded. By default False is
+        returned, indicating that the acceleration structure must be rebuilt.
+
+        :param list primitives: List of primitives whose bounds have changed.
+        :return: True if the acceleration structure was updated, False otherwise.
+        """
+
+        return False
+
     cpdef Intersection hit(self, Ray ray):
 
         raise NotImplementedError("Accelerator virtual method hit() has not been implemented.")
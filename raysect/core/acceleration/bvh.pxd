@@ -0,0 +1,84 @@
+# cython: language_level=3
+
+# Copyright (c) 2014-2020, Dr Alex Meakins, Raysect Project
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#     1. Redistributions of source code must retain the above copyright notice,
+#        this list of conditions and the following disclaimer.
+#
+#     2. Redistributions in binary form must reproduce the above copyright
+#        notice, this list of conditions and the following disclaimer in the
+#        documentation and/or other materials provided with the distribution.
+#
+#     3. Neither the name of the Raysect Project nor the names of its
+#        contributors may be used to endorse or promote products derived from
+#        this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+from raysect.core.acceleration.accelerator cimport Accelerator
+from raysect.core.math cimport Point3D
+from raysect.core.ray cimport Ray
+from raysect.core.intersection cimport Intersection
+from libc.stdint cimport int32_t
+
+
+# c-structure that represents a BVH node
+cdef struct bvhnode:
+
+    double lower[3]     # lower corner of node bounds
+    double upper[3]     # upper corner of node bounds
+    int32_t count       # number of primitives (LEAF), 0 (BRANCH)
+    int32_t index       # index of first primitive (LEAF), index of upper child (BRANCH)
+    int32_t axis        # split axis (BRANCH)
+    int32_t parent      # index of parent node, -1 for the root node
+
+
+# c-structure holding the bounds and centroid of a primitive during the build
+cdef struct bvhitem:
+
+    double lower[3]
+    double upper[3]
+    double centroid[3]
+    int32_t index
+
+
+cdef class BVH(Accelerator):
+
+    cdef:
+        bvhnode *_nodes
+        int32_t _node_count
+        int32_t _allocated_nodes
+        list _primitives
+        list _source
+        dict _locations
+        public bint refit_on_build
+
+    cpdef refit(self)
+
+    cdef int32_t _build_node(self, bvhitem *items, int32_t start, int32_t end, int32_t parent, int32_t depth) except -1
+
+    cdef int32_t _new_node(self) except -1
+
+    cdef void _refit_nodes(self)
+
+    cdef void _refit_path(self, int32_t id)
+
+    cdef void _refit_leaf(self, int32_t id)
+
+    cdef bint _refit_branch(self, int32_t id)
+
+    cdef void _reset(self)
@@ -0,0 +1,682 @@
+# cython: language_level=3
+
+# Copyright (c) 2014-2020, Dr Alex Meakins, Raysect Project
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#     1. Redistributions of source code must retain the above copyright notice,
+#        this list of conditions and the following disclaimer.
+#
+#     2. Redistributions in binary form must reproduce the above copyright
+#        notice, this list of conditions and the following disclaimer in the
+#        documentation and/or other materials provided with the distribution.
+#
+#     3. Neither the name of the Raysect Project nor the names of its
+#        contributors may be used to endorse or promote products derived from
+#        this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+from raysect.core.acceleration.boundprimitive cimport BoundPrimitive
+from libc.stdlib cimport malloc, realloc, free
+from libc.math cimport INFINITY
+cimport cython
+
+# this number of nodes will be pre-allocated when the BVH is initially created
+DEF INITIAL_NODE_COUNT = 128
+
+# friendly name for first node
+DEF ROOT_NODE = 0
+
+# maximum number of primitives in a leaf if a cheaper SAH split cannot be found
+DEF MAX_LEAF_ITEMS = 4
+
+# number of SAH buckets evaluated per split
+DEF BUCKETS = 16
+
+# relative cost of traversing a node vs testing a primitive bounding box
+DEF TRAVERSAL_COST = 0.125
+
+# maximum tree depth, also sets the traversal stack size
+DEF MAX_DEPTH = 64
+
+# update() refits the whole hierarchy if more than 1/FULL_REFIT_FRACTION of the primitives have changed
+DEF FULL_REFIT_FRACTION = 4
+
+
+cdef inline double _surface_area(double *lower, double *upper) nogil:
+
+    cdef double dx, dy, dz
+
+    dx = upper[0] - lower[0]
+    dy = upper[1] - lower[1]
+    dz = upper[2] - lower[2]
+    return 2 * (dx * dy + dx * dz + dy * dz)
+
+
+cdef inline void _empty_bounds(double *lower, double *upper) nogil:
+
+    cdef int32_t axis
+
+    for axis in range(3):
+        lower[axis] = INFINITY
+        upper[axis] = -INFINITY
+
+
+cdef inline void _union_bounds(double *lower, double *upper, double *other_lower, double *other_upper) nogil:
+
+    cdef int32_t axis
+
+    for axis in range(3):
+        if other_lower[axis] < lower[axis]:
+            lower[axis] = other_lower[axis]
+        if other_upper[axis] > upper[axis]:
+            upper[axis] = other_upper[axis]
+
+
+@cython.cdivision(True)
+cdef inline bint _hit_node(bvhnode *node, double *origin, double *direction, double *inv_direction, double max_distance, double *near) nogil:
+    """
+    Slab test of the ray against the node bounds.
+
+    :param node: The node to test.
+    :param origin: The ray origin.
+    :param direction: The ray direction.
+    :param inv_direction: The reciprocal of the ray direction.
+    :param max_distance: The maximum distance along the ray to consider.
+    :param near: The distance to the node entry point (returned).
+    :return: True if the ray intersects the node bounds, False otherwise.
+    """
+
+    cdef:
+        int32_t axis
+        double t0, t1, temp, t_min, t_max
+
+    t_min = 0
+    t_max = max_distance
+    for axis in range(3):
+
+        # ray parallel to the slab, only hits if the origin lies between the slab planes
+        if direction[axis] == 0:
+            if origin[axis] < node.lower[axis] or origin[axis] > node.upper[axis]:
+                return False
+            continue
+
+        t0 = (node.lower[axis] - origin[axis]) * inv_direction[axis]
+        t1 = (node.upper[axis] - origin[axis]) * inv_direction[axis]
+        if t0 > t1:
+            temp = t0
+            t0 = t1
+            t1 = temp
+
+        if t0 > t_min:
+            t_min = t0
+        if t1 < t_max:
+            t_max = t1
+        if t_min > t_max:
+            return False
+
+    near[0] = t_min
+    return True
+
+
+cdef class BVH(Accelerator):
+    """
+    A bounding volume hierarchy (BVH) acceleration structure.
+
+    The hierarchy is constructed using a binned Surface Area Heuristic (SAH)
+    and stored as a flattened, depth first array of nodes. The first child of
+    a branch always directly follows the branch in the array, giving good
+    memory locality during traversal.
+
+    Unlike a kd-tree, a BVH can be updated to follow moving primitives by
+    refitting the node bounds, rather than rebuilding the hierarchy. Refitting
+    is a linear time operation and is much cheaper than a rebuild. If
+    refit_on_build is True (the default), a call to build() with the same list
+    of primitives as the previous build refits the existing hierarchy. The
+    quality of a refit hierarchy degrades if the primitives move large
+    distances relative to one another. If this occurs, set refit_on_build to
+    False or force a rebuild by calling build() with refit_on_build disabled.
+
+    :param bool refit_on_build: Refit, rather than rebuild, the hierarchy if the
+      primitives are unchanged (default=True).
+
+    .. code-block:: pycon
+
+        >>> from raysect.core.acceleration import BVH
+        >>> from raysect.optical import World
+        >>>
+        >>> world = World()
+        >>> world.accelerator = BVH()
+    """
+
+    def __cinit__(self):
+        self._nodes = NULL
+        self._node_count = 0
+        self._allocated_nodes = 0
+
+    def __init__(self, bint refit_on_build=True):
+        self.refit_on_build = refit_on_build
+        self._primitives = []
+        self._source = []
+        self._locations = {}
+
+    def __dealloc__(self):
+        free(self._nodes)
+
+    def __getstate__(self):
+        return self.refit_on_build, self._source
+
+    def __setstate__(self, state):
+        self.refit_on_build, source = state
+        self._primitives = []
+        self._source = []
+        self._locations = {}
+        self.build(source)
+
+    def __reduce__(self):
+        return self.__new__, (self.__class__, ), self.__getstate__()
+
+    cpdef build(self, list primitives):
+        """
+        Builds the hierarchy for the supplied primitives.
+
+        :param list primitives: List of primitives.
+        """
+
+        cdef:
+            int32_t count, index, axis, id
+            bvhitem *items
+            BoundPrimitive bound_primitive
+            list ordered
+
+        # refit if the primitives are the same objects as the previous build
+        if self.refit_on_build and self._nodes != NULL and len(primitives) == len(self._source):
+            for index in range(len(primitives)):
+                if primitives[index] is not self._source[index]:
+                    break
+            else:
+                self.refit()
+                return
+
+        self._reset()
+        self._source = list(primitives)
+        self._primitives = [BoundPrimitive(primitive) for primitive in primitives]
+
+        count = len(self._primitives)
+        if count == 0:
+            return
+
+        items = <bvhitem *> malloc(sizeof(bvhitem) * count)
+        if not items:
+            raise MemoryError()
+
+        try:
+
+            for index, bound_primitive in enumerate(self._primitives):
+                for axis in range(3):
+                    items[index].lower[axis] = bound_primitive.box.lower.get_index(axis)
+                    items[index].upper[axis] = bound_primitive.box.upper.get_index(axis)
+                    items[index].centroid[axis] = 0.5 * (items[index].lower[axis] + items[index].upper[axis])
+                items[index].index = index
+
+            self._build_node(items, 0, count, -1, 0)
+
+            # reorder primitives so each leaf references a contiguous block
+            ordered = [self._primitives[items[index].index] for index in range(count)]
+            self._primitives = ordered
+
+            # record the location of each primitive for incremental updates
+            for id in range(self._node_count):
+                if self._nodes[id].count > 0:
+                    for index in range(self._nodes[id].index, self._nodes[id].index + self._nodes[id].count):
+                        bound_primitive = self._primitives[index]
+                        self._locations[bound_primitive.primitive] = (index, id)
+
+        finally:
+            free(items)
+
+    @cython.cdivision(True)
+    cdef int32_t _build_node(self, bvhitem *items, int32_t start, int32_t end, int32_t parent, int32_t depth) except -1:
+        """
+        Extends the hierarchy by creating a new node for the items in the range [start, end).
+
+        :param items: Array of build items, reordered in place.
+        :param start: Index of first item.
+        :param end: Index after the last item.
+        :param parent: The id (index) of the parent node, -1 for the root node.
+        :param depth: The current tree depth.
+        :return: The id (index) of the generated node.
+        """
+
+        cdef:
+            int32_t id, count, index, axis, bucket, best_bucket, split, upper_id, i, j
+            double centroid_lower[3]
+            double centroid_upper[3]
+            double bucket_lower[BUCKETS][3]
+            double bucket_upper[BUCKETS][3]
+            int32_t bucket_count[BUCKETS]
+            double lower[3]
+            double upper[3]
+            double cost, best_cost, recip_sa, extent, left_sa, right_sa
+            int32_t left_count, right_count
+            bvhitem temp
+
+        id = self._new_node()
+        self._nodes[id].parent = parent
+        count = end - start
+
+        # node bounds and centroid bounds
+        _empty_bounds(self._nodes[id].lower, self._nodes[id].upper)
+        _empty_bounds(centroid_lower, centroid_upper)
+        for index in range(start, end):
+            _union_bounds(self._nodes[id].lower, self._nodes[id].upper, items[index].lower, items[index].upper)
+            _union_bounds(centroid_lower, centroid_upper, items[index].centroid, items[index].centroid)
+
+        # split along the axis with the largest centroid extent
+        axis = 0
+        for i in range(1, 3):
+            if centroid_upper[i] - centroid_lower[i] > centroid_upper[axis] - centroid_lower[axis]:
+                axis = i
+        extent = centroid_upper[axis] - centroid_lower[axis]
+
+        # create a leaf if the items cannot be separated
+        if count == 1 or extent <= 0 or depth >= MAX_DEPTH - 1:
+            self._nodes[id].count = count
+            self._nodes[id].index = start
+            self._nodes[id].axis = axis
+            return id
+
+        # bin item centroids
+        for bucket in range(BUCKETS):
+            bucket_count[bucket] = 0
+            _empty_bounds(bucket_lower[bucket], bucket_upper[bucket])
+
+        for index in range(start, end):
+            bucket = <int32_t> (BUCKETS * (items[index].centroid[axis] - centroid_lower[axis]) / extent)
+            bucket = min(bucket, BUCKETS - 1)
+            bucket_count[bucket] += 1
+            _union_bounds(bucket_lower[bucket], bucket_upper[bucket], items[index].lower, items[index].upper)
+
+        # evaluate SAH cost of splitting after each bucket
+        recip_sa = 1.0 / _surface_area(self._nodes[id].lower, self._nodes[id].upper)
+        best_cost = INFINITY
+        best_bucket = 0
+        for bucket in range(BUCKETS - 1):
+
+            left_count = 0
+            right_count = 0
+            _empty_bounds(lower, upper)
+            for i in range(bucket + 1):
+                left_count += bucket_count[i]
+                _union_bounds(lower, upper, bucket_lower[i], bucket_upper[i])
+            left_sa = _surface_area(lower, upper) if left_count > 0 else 0
+
+            _empty_bounds(lower, upper)
+            for i in range(bucket + 1, BUCKETS):
+                right_count += bucket_count[i]
+                _union_bounds(lower, upper, bucket_lower[i], bucket_upper[i])
+            right_sa = _surface_area(lower, upper) if right_count > 0 else 0
+
+            cost = TRAVERSAL_COST + (left_count * left_sa + right_count * right_sa) * recip_sa
+            if cost < best_cost:
+                best_cost = cost
+                best_bucket = bucket
+
+        # create a leaf if splitting is more expensive than testing all the items
+        if count <= MAX_LEAF_ITEMS and best_cost >= count:
+            self._nodes[id].count = count
+            self._nodes[id].index = start
+            self._nodes[id].axis = axis
+            return id
+
+        # partition items about the chosen bucket boundary
+        i = start
+        j = end - 1
+        while i <= j:
+            bucket = <int32_t> (BUCKETS * (items[i].centroid[axis] - centroid_lower[axis]) / extent)
+            bucket = min(bucket, BUCKETS - 1)
+            if bucket <= best_bucket:
+                i += 1
+            else:
+                temp = items[i]
+                items[i] = items[j]
+                items[j] = temp
+                j -= 1
+        split = i
+
+        # guard against a degenerate partition by splitting at the midpoint of the range
+        if split == start or split == end:
+            split = start + count // 2
+
+        # the lower child is always the next node in the array
+        # WARNING: the node array may be reallocated by the recursive calls, always access nodes by index
+        self._build_node(items, start, split, id, depth + 1)
+        upper_id = self._build_node(items, split, end, id, depth + 1)
+
+        self._nodes[id].count = 0
+        self._nodes[id].index = upper_id
+        self._nodes[id].axis = axis
+        return id
+
+    cdef int32_t _new_node(self) except -1:
+        """
+        Adds a new, empty node to the node array.
+
+        :return: The id (index) of the generated node.
+        """
+
+        cdef:
+            bvhnode *new_nodes = NULL
+            int32_t id, new_size
+
+        # have we exhausted the allocated memory?
+        if self._node_count == self._allocated_nodes:
+
+            # double allocated memory
+            new_size = max(INITIAL_NODE_COUNT, self._allocated_nodes * 2)
+            new_nodes = <bvhnode *> realloc(self._nodes, sizeof(bvhnode) * new_size)
+            if not new_nodes:
+                raise MemoryError()
+
+            self._nodes = new_nodes
+            self._allocated_nodes = new_size
+
+        id = self._node_count
+        self._node_count += 1
+        return id
+
+    cpdef refit(self):
+        """
+        Updates the hierarchy to enclose the current primitive bounding boxes.
+
+        The structure of the hierarchy is unchanged, only the node bounds are
+        recalculated. This is much faster than a rebuild and is intended for
+        scenes where primitives are moved or deformed between renders.
+        """
+
+        cdef:
+            BoundPrimitive bound_primitive
+
+        if self._nodes == NULL:
+            return
+
+        # refresh the bounding boxes of the primitives
+        self._primitives = [BoundPrimitive(bound_primitive.primitive) for bound_primitive in self._primitives]
+        self._refit_nodes()
+
+    cpdef bint update(self, list primitives) except -1:
+        """
+        Updates the hierarchy following a change to the bounds of the supplied primitives.
+
+        Only the leaves holding the supplied primitives, and the branches
+        above them, are refit. If a large fraction of the primitives have
+        changed, the whole hierarchy is refit. False is returned if any of
+        the primitives are not held by the hierarchy.
+
+        :param list primitives: List of primitives whose bounds have changed.
+        :return: True if the hierarchy was updated, False if a rebuild is required.
+        """
+
+        cdef:
+            object primitive
+            tuple location
+            int32_t index, id
+            bint refit_all
+            set leaves
+
+        if self._nodes == NULL:
+            return False
+
+        for primitive in primitives:
+            if primitive not in self._locations:
+                return False
+
+        # beyond this point refitting individual paths through the tree is no cheaper than a full refit
+        refit_all = len(primitives) * FULL_REFIT_FRACTION > len(self._primitives)
+
+        leaves = set()
+        for primitive in primitives:
+            location = self._locations[primitive]
+            index = location[0]
+            id = location[1]
+            self._primitives[index] = BoundPrimitive(primitive)
+            leaves.add(id)
+
+        if refit_all:
+            self._refit_nodes()
+        else:
+            for id in leaves:
+                self._refit_path(id)
+
+        return True
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    cdef void _refit_nodes(self):
+        """
+        Recalculates the bounds of every node from the primitive bounding boxes.
+        """
+
+        cdef int32_t id
+
+        # children always follow their parent in the node array, a reverse scan visits children before parents
+        for id in range(self._node_count - 1, -1, -1):
+            if self._nodes[id].count > 0:
+                self._refit_leaf(id)
+            else:
+                self._refit_branch(id)
+
+    cdef void _refit_path(self, int32_t id):
+        """
+        Recalculates the bounds of a leaf and of each of its ancestors.
+
+        The walk towards the root stops early if a branch is unchanged.
+
+        :param id: The id (index) of the leaf node.
+        """
+
+        self._refit_leaf(id)
+        id = self._nodes[id].parent
+        while id >= 0:
+            if not self._refit_branch(id):
+                return
+            id = self._nodes[id].parent
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    cdef void _refit_leaf(self, int32_t id):
+        """
+        Recalculates the bounds of a leaf node from its primitive bounding boxes.
+
+        :param id: The id (index) of the leaf node.
+        """
+
+        cdef:
+            int32_t index, axis
+            BoundPrimitive bound_primitive
+            bvhnode *node
+            double lower[3]
+            double upper[3]
+
+        node = &self._nodes[id]
+        _empty_bounds(node.lower, node.upper)
+        for index in range(node.index, node.index + node.count):
+            bound_primitive = self._primitives[index]
+            for axis in range(3):
+                lower[axis] = bound_primitive.box.lower.get_index(axis)
+                upper[axis] = bound_primitive.box.upper.get_index(axis)
+            _union_bounds(node.lower, node.upper, lower, upper)
+
+    cdef bint _refit_branch(self, int32_t id):
+        """
+        Recalculates the bounds of a branch node from the bounds of its children.
+
+        :param id: The id (index) of the branch node.
+        :return: True if the bounds of the node changed, False otherwise.
+        """
+
+        cdef:
+            int32_t axis
+            bvhnode *node
+            bvhnode *upper_child
+            double lower[3]
+            double upper[3]
+            bint changed
+
+        node = &self._nodes[id]
+        upper_child = &self._nodes[node.index]
+
+        # the lower child always directly follows its parent
+        for axis in range(3):
+            lower[axis] = self._nodes[id + 1].lower[axis]
+            upper[axis] = self._nodes[id + 1].upper[axis]
+        _union_bounds(lower, upper, upper_child.lower, upper_child.upper)
+
+        changed = False
+        for axis in range(3):
+            if node.lower[axis] != lower[axis] or node.upper[axis] != upper[axis]:
+                changed = True
+            node.lower[axis] = lower[axis]
+            node.upper[axis] = upper[axis]
+        return changed
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    @cython.cdivision(True)
+    cpdef Intersection hit(self, Ray ray):
+
+        cdef:
+            int32_t stack[2 * MAX_DEPTH]
+            int32_t stack_size, id, index, axis, near_id, far_id
+            double origin[3]
+            double direction[3]
+            double inv_direction[3]
+            double distance, near
+            bvhnode *node
+            Intersection intersection, closest_intersection
+            BoundPrimitive primitive
+
+        if self._nodes == NULL:
+            return None
+
+        for axis in range(3):
+            origin[axis] = ray.origin.get_index(axis)
+            direction[axis] = ray.direction.get_index(axis)
+            inv_direction[axis] = 1.0 / direction[axis] if direction[axis] != 0 else INFINITY
+
+        # find the closest primitive-ray intersection, initial search distance is maximum possible ray extent
+        distance = ray.max_distance
+        closest_intersection = None
+
+        stack[0] = ROOT_NODE
+        stack_size = 1
+        while stack_size > 0:
+
+            stack_size -= 1
+            id = stack[stack_size]
+            node = &self._nodes[id]
+
+            # skip nodes that are missed, or that lie beyond the closest intersection found so far
+            if not _hit_node(node, origin, direction, inv_direction, distance, &near):
+                continue
+
+            if node.count > 0:
+
+                for index in range(node.index, node.index + node.count):
+                    primitive = <BoundPrimitive> self._primitives[index]
+                    intersection = primitive.hit(ray)
+                    if intersection is not None and intersection.ray_distance < distance:
+                        distance = intersection.ray_distance
+                        closest_intersection = intersection
+
+            else:
+
+                # visit the child nearest the ray origin first
+                if direction[node.axis] < 0:
+                    near_id = node.index
+                    far_id = id + 1
+                else:
+                    near_id = id + 1
+                    far_id = node.index
+
+                stack[stack_size] = far_id
+                stack[stack_size + 1] = near_id
+                stack_size += 2
+
+        return closest_intersection
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    cpdef list contains(self, Point3D point):
+
+        cdef:
+            int32_t stack[2 * MAX_DEPTH]
+            int32_t stack_size, id, index, axis
+            double p[3]
+            bint inside
+            bvhnode *node
+            list enclosing_primitives
+            BoundPrimitive primitive
+
+        if self._nodes == NULL:
+            return []
+
+        p[0] = point.x
+        p[1] = point.y
+        p[2] = point.z
+
+        enclosing_primitives = []
+
+        stack[0] = ROOT_NODE
+        stack_size = 1
+        while stack_size > 0:
+
+            stack_size -= 1
+            id = stack[stack_size]
+            node = &self._nodes[id]
+
+            inside = True
+            for axis in range(3):
+                if p[axis] < node.lower[axis] or p[axis] > node.upper[axis]:
+                    inside = False
+                    break
+            if not inside:
+                continue
+
+            if node.count > 0:
+                for index in range(node.index, node.index + node.count):
+                    primitive = <BoundPrimitive> self._primitives[index]
+                    if primitive.contains(point):
+                        enclosing_primitives.append(primitive.primitive)
+            else:
+                stack[stack_size] = node.index
+                stack[stack_size + 1] = id + 1
+                stack_size += 2
+
+        return enclosing_primitives
+
+    cdef void _reset(self):
+        """
+        Resets the hierarchy, de-allocating all memory.
+        """
+
+        free(self._nodes)
+        self._nodes = NULL
+        self._node_count = 0
+        self._allocated_nodes = 0
+        self._primitives = []
+        self._source = []
+        self._locations = {}
@@ -0,0 +1,180 @@
+# Copyright (c) 2014-2020, Dr Alex Meakins, Raysect Project
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#     1. Redistributions of source code must retain the above copyright notice,
+#        this list of conditions and the following disclaimer.
+#
+#     2. Redistributions in binary form must reproduce the above copyright
+#        notice, this list of conditions and the following disclaimer in the
+#        documentation and/or other materials provided with the distribution.
+#
+#     3. Neither the name of the Raysect Project nor the names of its
+#        contributors may be used to endorse or promote products derived from
+#        this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+import pickle
+import random
+import unittest
+
+from raysect.core import World, Point3D, Vector3D, Ray, translate
+from raysect.core.acceleration import BVH, Unaccelerated
+from raysect.primitive import Sphere
+
+
+class TestBVH(unittest.TestCase):
+
+    def setUp(self):
+
+        rng = random.Random(1)
+        self.world = World()
+        self.spheres = []
+        for _ in range(200):
+            position = translate(rng.uniform(-5, 5), rng.uniform(-5, 5), rng.uniform(-5, 5))
+            self.spheres.append(Sphere(rng.uniform(0.05, 0.3), parent=self.world, transform=position))
+
+        self.rays = []
+        for _ in range(1000):
+            origin = Point3D(rng.uniform(-6, 6), rng.uniform(-6, 6), -10)
+            direction = Vector3D(rng.uniform(-0.3, 0.3), rng.uniform(-0.3, 0.3), 1)
+            self.rays.append(Ray(origin, direction))
+
+        # axis aligned rays exercise the zero direction component path of the node test
+        self.rays.append(Ray(Point3D(0, 0, -10), Vector3D(0, 0, 1)))
+        self.rays.append(Ray(Point3D(-10, 1, 1), Vector3D(1, 0, 0)))
+
+        self.points = [Point3D(rng.uniform(-5, 5), rng.uniform(-5, 5), rng.uniform(-5, 5)) for _ in range(1000)]
+        self.points += [sphere.to_root() * Point3D(0, 0, 0) for sphere in self.spheres[:20]]
+
+    def _trace(self, accelerator):
+
+        results = []
+        for ray in self.rays:
+            intersection = accelerator.hit(ray)
+            if intersection is None:
+                results.append(None)
+            else:
+                results.append((intersection.primitive, intersection.ray_distance))
+        return results
+
+    def _contains(self, accelerator):
+        return [set(accelerator.contains(point)) for point in self.points]
+
+    def _assert_matches_reference(self, accelerator):
+
+        reference = Unaccelerated()
+        reference.build(self.world.primitives)
+
+        expected = self._trace(reference)
+        result = self._trace(accelerator)
+        self.assertTrue(any(item is not None for item in expected), "Test scene produced no intersections.")
+        for expected_item, result_item in zip(expected, result):
+            if expected_item is None:
+                self.assertIsNone(result_item)
+            else:
+                self.assertIs(result_item[0], expected_item[0])
+                self.assertAlmostEqual(result_item[1], expected_item[1], places=12)
+
+        self.assertEqual(self._contains(accelerator), self._contains(reference))
+
+    def test_hit_and_contains(self):
+
+        accelerator = BVH()
+        accelerator.build(self.world.primitives)
+        self._assert_matches_reference(accelerator)
+
+    def test_empty(self):
+
+        accelerator = BVH()
+        accelerator.build([])
+        self.assertIsNone(accelerator.hit(self.rays[0]))
+        self.assertEqual(accelerator.contains(Point3D(0, 0, 0)), [])
+
+    def test_refit(self):
+
+        accelerator = BVH()
+        accelerator.build(self.world.primitives)
+
+        # move the primitives, a build with the same primitives should refit rather than rebuild
+        rng = random.Random(2)
+        for sphere in self.spheres:
+            sphere.transform = translate(rng.uniform(-5, 5), rng.uniform(-5, 5), rng.uniform(-5, 5))
+
+        accelerator.build(self.world.primitives)
+        self._assert_matches_reference(accelerator)
+
+        accelerator.refit()
+        self._assert_matches_reference(accelerator)
+
+    def test_update(self):
+
+        accelerator = BVH()
+        accelerator.build(self.world.primitives)
+
+        # move a few primitives, only their paths through the hierarchy are refit
+        rng = random.Random(3)
+        moved = self.spheres[:5]
+        for sphere in moved:
+            sphere.transform = translate(rng.uniform(-5, 5), rng.uniform(-5, 5), rng.uniform(-5, 5))
+
+        self.assertTrue(accelerator.update(moved))
+        self._assert_matches_reference(accelerator)
+
+        # move most primitives, the whole hierarchy is refit
+        moved = self.spheres[:150]
+        for sphere in moved:
+            sphere.transform = translate(rng.uniform(-5, 5), rng.uniform(-5, 5), rng.uniform(-5, 5))
+
+        self.assertTrue(accelerator.update(moved))
+        self._assert_matches_reference(accelerator)
+
+        # primitives not held by the hierarchy require a rebuild
+        self.assertFalse(accelerator.update([Sphere()]))
+
+    def test_world_update(self):
+
+        self.world.accelerator = BVH()
+        self.world.build_accelerator()
+
+        # move a sphere in front of all the others
+        self.spheres[0].transform = translate(0, 0, -8)
+        intersection = self.world.hit(Ray(Point3D(0, 0, -10), Vector3D(0, 0, 1)))
+        self.assertIs(intersection.primitive, self.spheres[0])
+
+    def test_world_accelerator(self):
+
+        self.world.accelerator = BVH()
+        intersection = self.world.hit(Ray(Point3D(0, 0, -10), Vector3D(0, 0, 1)))
+        reference = Unaccelerated()
+        reference.build(self.world.primitives)
+        expected = reference.hit(Ray(Point3D(0, 0, -10), Vector3D(0, 0, 1)))
+        if expected is None:
+            self.assertIsNone(intersection)
+        else:
+            self.assertIs(intersection.primitive, expected.primitive)
+
+    def test_pickle(self):
+
+        accelerator = BVH(refit_on_build=False)
+        accelerator.build(self.world.primitives)
+        restored = pickle.loads(pickle.dumps(accelerator))
+        self.assertFalse(restored.refit_on_build)
+        self.assertEqual(len(self._trace(restored)), len(self.rays))
+
+
+if __name__ == "__main__":
+    unittest.main()
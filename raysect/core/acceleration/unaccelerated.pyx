@@ -59,6 +59,28 @@ cdef class Unaccelerated(Accelerator):
             self.primitives.append(accel_primitive)
             self.world_box.union(accel_primitive.box)
 
+    cpdef bint update(self, list primitives) except -1:
+
+        cdef:
+            int index
+            set changed
+            BoundPrimitive accel_primitive
+
+        changed = set(primitives)
+        self.world_box = BoundingBox3D()
+
+        for index in range(len(self.primitives)):
+
+            accel_primitive = self.primitives[index]
+            if accel_primitive.primitive in changed:
+                changed.remove(accel_primitive.primitive)
+                accel_primitive = BoundPrimitive(accel_primitive.primitive)
+                self.primitives[index] = accel_primitive
+            self.world_box.union(accel_primitive.box)
+
+        # any remaining primitives are unknown to the accelerator
+        return len(changed) == 0
+
     @cython.boundscheck(False)
     @cython.wraparound(False)
     cpdef Intersection hit(self, Ray ray):
@@ -0,0 +1,60 @@
+# Copyright (c) 2014-2020, Dr Alex Meakins, Raysect Project
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#     1. Redistributions of source code must retain the above copyright notice,
+#        this list of conditions and the following disclaimer.
+#
+#     2. Redistributions in binary form must reproduce the above copyright
+#        notice, this list of conditions and the following disclaimer in the
+#        documentation and/or other materials provided with the distribution.
+#
+#     3. Neither the name of the Raysect Project nor the names of its
+#        contributors may be used to endorse or promote products derived from
+#        this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Unit tests for the tetrahedra utilities.
+"""
+
+import unittest
+import numpy as np
+from raysect.core.math.cython.tetrahedra import _test_barycentric_coords_tetra as barycentric_coords_tetra
+
+
+class TestTetrahedra(unittest.TestCase):
+
+    def test_barycentric_coords(self):
+        """Tests the barycentric coordinate calculation."""
+
+        v1, v2, v3, v4 = (0.2, 0.1, -1.0), (2.0, 0.3, -0.5), (0.5, 1.7, 0.0), (0.4, 0.6, 1.5)
+
+        # vertices
+        np.testing.assert_allclose(barycentric_coords_tetra(v1, v2, v3, v4, v1), (1, 0, 0, 0), atol=1e-12)
+        np.testing.assert_allclose(barycentric_coords_tetra(v1, v2, v3, v4, v2), (0, 1, 0, 0), atol=1e-12)
+        np.testing.assert_allclose(barycentric_coords_tetra(v1, v2, v3, v4, v3), (0, 0, 1, 0), atol=1e-12)
+        np.testing.assert_allclose(barycentric_coords_tetra(v1, v2, v3, v4, v4), (0, 0, 0, 1), atol=1e-12)
+
+        # arbitrary points are reconstructed from their coordinates
+        vertices = np.array([v1, v2, v3, v4])
+        for weights in ([0.25, 0.25, 0.25, 0.25], [0.1, 0.2, 0.3, 0.4], [-0.5, 0.5, 0.7, 0.3]):
+            point = np.dot(weights, vertices)
+            np.testing.assert_allclose(barycentric_coords_tetra(v1, v2, v3, v4, point), weights, atol=1e-12)
+
+
+if __name__ == "__main__":
+    unittest.main()
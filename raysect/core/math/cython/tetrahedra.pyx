@@ -0,0 +1,148 @@
+# cython: language_level=3
+
+# Copyright (c) 2014-2020, Dr Alex Meakins, Raysect Project
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#     1. Redistributions of source code must retain the above copyright notice,
+#        this list of conditions and the following disclaimer.
+#
+#     2. Redistributions in binary form must reproduce the above copyright
+#        notice, this list of conditions and the following disclaimer in the
+#        documentation and/or other materials provided with the distribution.
+#
+#     3. Neither the name of the Raysect Project nor the names of its
+#        contributors may be used to endorse or promote products derived from
+#        this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+cimport cython
+
+
+@cython.cdivision(True)
+cdef void barycentric_coords_tetra(double v1x, double v1y, double v1z, double v2x, double v2y, double v2z,
+                                   double v3x, double v3y, double v3z, double v4x, double v4y, double v4z,
+                                   double px, double py, double pz,
+                                   double *alpha, double *beta, double *gamma, double *delta) nogil:
+    """
+    Cython utility for calculating the barycentric coordinates of a test point
+    with respect to a tetrahedron.
+
+    The coordinates are obtained with Cramer's rule, expressing the point
+    relative to vertex 4 in the basis of the three edge vectors that meet at
+    vertex 4. The tetrahedron must not be degenerate.
+
+    :param double v1x: x coord of tetrahedron vertex 1.
+    :param double v1y: y coord of tetrahedron vertex 1.
+    :param double v1z: z coord of tetrahedron vertex 1.
+    :param double v2x: x coord of tetrahedron vertex 2.
+    :param double v2y: y coord of tetrahedron vertex 2.
+    :param double v2z: z coord of tetrahedron vertex 2.
+    :param double v3x: x coord of tetrahedron vertex 3.
+    :param double v3y: y coord of tetrahedron vertex 3.
+    :param double v3z: z coord of tetrahedron vertex 3.
+    :param double v4x: x coord of tetrahedron vertex 4.
+    :param double v4y: y coord of tetrahedron vertex 4.
+    :param double v4z: z coord of tetrahedron vertex 4.
+    :param double px: x coord of test point.
+    :param double py: y coord of test point.
+    :param double pz: z coord of test point.
+    :param double* alpha: returned coordinate alpha.
+    :param double* beta: returned coordinate beta.
+    :param double* gamma: returned coordinate gamma.
+    :param double* delta: returned coordinate delta.
+    """
+
+    cdef:
+        double ax, ay, az, bx, by, bz, cx, cy, cz, dx, dy, dz
+        double bcx, bcy, bcz
+        double norm
+
+    # edge vectors and test point relative to vertex 4
+    ax = v1x - v4x
+    ay = v1y - v4y
+    az = v1z - v4z
+
+    bx = v2x - v4x
+    by = v2y - v4y
+    bz = v2z - v4z
+
+    cx = v3x - v4x
+    cy = v3y - v4y
+    cz = v3z - v4z
+
+    dx = px - v4x
+    dy = py - v4y
+    dz = pz - v4z
+
+    # b x c is shared by the determinant and alpha
+    bcx = by * cz - bz * cy
+    bcy = bz * cx - bx * cz
+    bcz = bx * cy - by * cx
+
+    norm = 1 / (ax * bcx + ay * bcy + az * bcz)
+
+    # compute barycentric coordinates
+    alpha[0] = norm * (dx * bcx + dy * bcy + dz * bcz)
+    beta[0] = norm * (ax * (dy * cz - dz * cy) + ay * (dz * cx - dx * cz) + az * (dx * cy - dy * cx))
+    gamma[0] = norm * (ax * (by * dz - bz * dy) + ay * (bz * dx - bx * dz) + az * (bx * dy - by * dx))
+    delta[0] = 1.0 - alpha[0] - beta[0] - gamma[0]
+
+
+def _test_barycentric_coords_tetra(v1, v2, v3, v4, p):
+    """Expose cython function for testing."""
+
+    cdef double alpha, beta, gamma, delta
+
+    barycentric_coords_tetra(v1[0], v1[1], v1[2], v2[0], v2[1], v2[2],
+                             v3[0], v3[1], v3[2], v4[0], v4[1], v4[2],
+                             p[0], p[1], p[2], &alpha, &beta, &gamma, &delta)
+    return alpha, beta, gamma, delta
+
+
+cdef bint barycentric_inside_tetrahedra(double alpha, double beta, double gamma, double delta) nogil:
+    """
+    Cython utility for testing if a barycentric point lies inside a tetrahedron.
+
+    :param double alpha: barycentric coordinate alpha.
+    :param double beta: barycentric coordinate beta.
+    :param double gamma: barycentric coordinate gamma.
+    :param double delta: barycentric coordinate delta.
+    :rtype: bool
+    """
+
+    # Point is inside tetrahedron if all coordinates lie in range [0, 1]
+    # if all are > 0 then none can be > 1 from definition of barycentric coordinates
+    return alpha >= 0 and beta >= 0 and gamma >= 0 and delta >= 0
+
+
+cdef double barycentric_interpolation_tetra(double alpha, double beta, double gamma, double delta,
+                                            double va, double vb, double vc, double vd) nogil:
+    """
+    Cython utility for interpolation of data at tetrahedron vertices.
+
+    :param double alpha: Vertex 1 barycentric coordinate.
+    :param double beta: Vertex 2 barycentric coordinate.
+    :param double gamma: Vertex 3 barycentric coordinate.
+    :param double delta: Vertex 4 barycentric coordinate.
+    :param double va: Data point at Vertex 1.
+    :param double vb: Data point at Vertex 2.
+    :param double vc: Data point at Vertex 3.
+    :param double vd: Data point at Vertex 4.
+    :rtype: double
+    """
+
+    return alpha * va + beta * vb + gamma * vc + delta * vd
@@ -34,3 +34,6 @@ from raysect.core.math.function.base cimport Function
 
 cdef class FloatFunction(Function):
     pass
+
+
+cdef tuple prepare_array_evaluation(tuple coordinates, object out)
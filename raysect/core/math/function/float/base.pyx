@@ -29,6 +29,9 @@
 # ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
 # POSSIBILITY OF SUCH DAMAGE.
 
+import numpy as np
+
+
 cdef class FloatFunction(Function):
     """
     The base class of all functions that return a float.
@@ -38,3 +41,30 @@ cdef class FloatFunction(Function):
 
     def __repr__(self):
         return 'FloatFunction()'
+
+
+cdef tuple prepare_array_evaluation(tuple coordinates, object out):
+    """
+    Prepares the arguments of a vectorised function evaluation.
+
+    The coordinate arrays are broadcast against each other and converted to
+    flattened, contiguous arrays of doubles. If an output array is not supplied,
+    one is allocated with the broadcast shape of the coordinates.
+
+    :param tuple coordinates: Tuple of array-like coordinates.
+    :param object out: Output array or None.
+    :return: Tuple containing the output array, a flattened view of the output
+      array and the flattened coordinate arrays.
+    """
+
+    arrays = np.broadcast_arrays(*[np.asarray(c, dtype=np.float64) for c in coordinates])
+    shape = arrays[0].shape
+
+    if out is None:
+        out = np.empty(shape, dtype=np.float64)
+
+    elif not isinstance(out, np.ndarray) or out.dtype != np.float64 or out.shape != shape \
+            or not out.flags.c_contiguous or not out.flags.writeable:
+        raise ValueError("The output array must be a writeable, C contiguous float64 array with shape {}.".format(shape))
+
+    return tuple([out, out.reshape(-1)] + [np.ascontiguousarray(a).reshape(-1) for a in arrays])
@@ -34,3 +34,4 @@ from raysect.core.math.function.float.function1d.constant cimport Constant1D
 from raysect.core.math.function.float.function1d.autowrap cimport autowrap_function1d
 from raysect.core.math.function.float.function1d.arg cimport Arg1D
 from raysect.core.math.function.float.function1d.cmath cimport *
+from raysect.core.math.function.float.function1d.interpolate cimport *
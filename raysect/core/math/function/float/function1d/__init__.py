@@ -31,5 +31,6 @@
 
 from .base import Function1D
 from .constant import Constant1D
+from .interpolate import *
 from .arg import Arg1D
 from .cmath import *
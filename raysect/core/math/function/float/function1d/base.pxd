@@ -36,6 +36,8 @@ from raysect.core.math.function.float.base cimport FloatFunction
 cdef class Function1D(FloatFunction):
     cdef double evaluate(self, double x) except? -1e999
 
+    cdef int _evaluate_array(self, const double[::1] x, double[::1] out) except -1
+
 
 cdef class AddFunction1D(Function1D):
     cdef Function1D _function1, _function2
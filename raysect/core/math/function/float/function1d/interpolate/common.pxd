@@ -0,0 +1,62 @@
+# cython: language_level=3
+
+# Copyright (c) 2014-2020, Dr Alex Meakins, Raysect Project
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#     1. Redistributions of source code must retain the above copyright notice,
+#        this list of conditions and the following disclaimer.
+#
+#     2. Redistributions in binary form must reproduce the above copyright
+#        notice, this list of conditions and the following disclaimer in the
+#        documentation and/or other materials provided with the distribution.
+#
+#     3. Neither the name of the Raysect Project nor the names of its
+#        contributors may be used to endorse or promote products derived from
+#        this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+cimport numpy as np
+
+
+cdef enum InterpolationType:
+    INTERPOLATION_LINEAR, INTERPOLATION_CUBIC
+
+
+cdef enum ExtrapolationType:
+    EXTRAPOLATION_NONE, EXTRAPOLATION_NEAREST, EXTRAPOLATION_LINEAR
+
+
+cdef class GridAxis:
+
+    cdef:
+        readonly np.ndarray coordinates
+        double[::1] _coordinates_mv
+        int _size
+        bint _uniform
+        double _lower, _upper, _inverse_spacing
+        InterpolationType _interpolation
+        ExtrapolationType _extrapolation
+        double _extrapolation_range
+
+    cdef int _find_cell(self, double v) nogil
+
+    cdef int weights(self, double v, double *w, int *first) except -1
+
+
+cdef InterpolationType parse_interpolation_type(str interpolation_type) except *
+
+cdef ExtrapolationType parse_extrapolation_type(str extrapolation_type) except *
@@ -0,0 +1,229 @@
+# cython: language_level=3
+
+# Copyright (c) 2014-2020, Dr Alex Meakins, Raysect Project
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#     1. Redistributions of source code must retain the above copyright notice,
+#        this list of conditions and the following disclaimer.
+#
+#     2. Redistributions in binary form must reproduce the above copyright
+#        notice, this list of conditions and the following disclaimer in the
+#        documentation and/or other materials provided with the distribution.
+#
+#     3. Neither the name of the Raysect Project nor the names of its
+#        contributors may be used to endorse or promote products derived from
+#        this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+import numpy as np
+cimport numpy as np
+from libc.math cimport floor
+from raysect.core.math.cython cimport find_index
+cimport cython
+
+# relative tolerance used to identify uniformly spaced coordinates
+DEF UNIFORM_TOLERANCE = 1e-9
+
+
+cdef class GridAxis:
+    """
+    An axis of a rectilinear interpolation grid.
+
+    Calculates the interpolation weights for a coordinate along the axis. The
+    weights multiply the data values of a contiguous range of grid points,
+    the interpolated value is the sum of these products. The weights of
+    multidimensional grids are the product of the weights of each axis.
+
+    Cubic interpolation uses a cubic Hermite spline with the gradient at each
+    grid point estimated by finite differences of the neighbouring points. The
+    result is continuous in value and gradient.
+
+    If the coordinates are uniformly spaced, the cell containing a coordinate
+    is calculated directly, otherwise it is found by a bisection search.
+
+    :param object coordinates: A 1D array of strictly increasing coordinates, containing at least two values.
+    :param str interpolation_type: The interpolation type, 'linear' or 'cubic'.
+    :param str extrapolation_type: The extrapolation type, 'none', 'nearest' or 'linear'.
+    :param double extrapolation_range: The maximum distance beyond the grid edges at which extrapolation is permitted.
+    :param str name: The name of the axis, used in error messages.
+    """
+
+    def __init__(self, object coordinates, str interpolation_type, str extrapolation_type, double extrapolation_range, str name='x'):
+
+        coordinates = np.array(coordinates, dtype=np.float64)
+
+        if coordinates.ndim != 1:
+            raise ValueError("The {} coordinates must be a 1D array.".format(name))
+
+        if coordinates.shape[0] < 2:
+            raise ValueError("At least two {} coordinates must be supplied.".format(name))
+
+        spacing = np.diff(coordinates)
+        if not (spacing > 0).all():
+            raise ValueError("The {} coordinates must be strictly increasing.".format(name))
+
+        if extrapolation_range < 0:
+            raise ValueError("The extrapolation range must be greater than or equal to zero.")
+
+        self.coordinates = coordinates
+        self._coordinates_mv = coordinates
+        self._size = coordinates.shape[0]
+        self._lower = coordinates[0]
+        self._upper = coordinates[self._size - 1]
+        self._uniform = (np.abs(spacing - spacing.mean()) <= UNIFORM_TOLERANCE * spacing.mean()).all()
+        self._inverse_spacing = (self._size - 1) / (self._upper - self._lower)
+        self._interpolation = parse_interpolation_type(interpolation_type)
+        self._extrapolation = parse_extrapolation_type(extrapolation_type)
+        self._extrapolation_range = extrapolation_range
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    @cython.initializedcheck(False)
+    cdef int _find_cell(self, double v) nogil:
+        """
+        Returns the index of the cell containing a coordinate inside the grid.
+
+        The upper grid edge is included in the last cell.
+        """
+
+        cdef int index
+
+        if not self._uniform:
+            return min(find_index(self._coordinates_mv, v), self._size - 2)
+
+        # correct for rounding in the direct calculation of the cell
+        index = <int> floor((v - self._lower) * self._inverse_spacing)
+        index = max(0, min(index, self._size - 2))
+        if v < self._coordinates_mv[index] and index > 0:
+            index -= 1
+        elif v >= self._coordinates_mv[index + 1] and index < self._size - 2:
+            index += 1
+        return index
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    @cython.initializedcheck(False)
+    @cython.cdivision(True)
+    cdef int weights(self, double v, double *w, int *first) except -1:
+        """
+        Calculates the interpolation weights for a coordinate.
+
+        :param double v: The coordinate.
+        :param double *w: An array of at least four doubles to hold the weights.
+        :param int *first: Returns the index of the grid point of the first weight.
+        :return: The number of weights.
+        """
+
+        cdef:
+            double[::1] x = self._coordinates_mv
+            int i, n = self._size, start, end, k
+            double t, h, t2, t3, h00, h01, h10, h11, c
+            double cubic[4]
+
+        # extrapolation
+        if v < self._lower or v > self._upper:
+
+            if self._extrapolation == EXTRAPOLATION_NONE:
+                raise ValueError(
+                    "The requested coordinate ({}) lies outside the range of the data ({} to {}).".format(v, self._lower, self._upper)
+                )
+
+            if v < self._lower - self._extrapolation_range or v > self._upper + self._extrapolation_range:
+                raise ValueError("The requested coordinate ({}) lies outside the extrapolation range.".format(v))
+
+            if self._extrapolation == EXTRAPOLATION_NEAREST:
+                first[0] = 0 if v < self._lower else n - 1
+                w[0] = 1.0
+                return 1
+
+            # linear extrapolation from the edge cell
+            i = 0 if v < self._lower else n - 2
+            t = (v - x[i]) / (x[i + 1] - x[i])
+            first[0] = i
+            w[0] = 1.0 - t
+            w[1] = t
+            return 2
+
+        i = self._find_cell(v)
+        h = x[i + 1] - x[i]
+        t = (v - x[i]) / h
+
+        if self._interpolation == INTERPOLATION_LINEAR:
+            first[0] = i
+            w[0] = 1.0 - t
+            w[1] = t
+            return 2
+
+        # cubic hermite basis functions
+        t2 = t * t
+        t3 = t2 * t
+        h00 = 2 * t3 - 3 * t2 + 1
+        h10 = t3 - 2 * t2 + t
+        h01 = -2 * t3 + 3 * t2
+        h11 = t3 - t2
+
+        # weights of the points i-1, i, i+1 and i+2
+        cubic[0] = 0.0
+        cubic[1] = h00
+        cubic[2] = h01
+        cubic[3] = 0.0
+
+        # gradient at point i, central difference or one sided at the grid edge
+        if i > 0:
+            c = h10 * h / (x[i + 1] - x[i - 1])
+            cubic[2] += c
+            cubic[0] -= c
+        else:
+            cubic[2] += h10
+            cubic[1] -= h10
+
+        # gradient at point i+1, central difference or one sided at the grid edge
+        if i + 2 < n:
+            c = h11 * h / (x[i + 2] - x[i])
+            cubic[3] += c
+            cubic[1] -= c
+        else:
+            cubic[2] += h11
+            cubic[1] -= h11
+
+        # discard the points that lie outside the grid
+        start = 0 if i > 0 else 1
+        end = 4 if i + 2 < n else 3
+        for k in range(start, end):
+            w[k - start] = cubic[k]
+        first[0] = i - 1 + start
+        return end - start
+
+
+cdef InterpolationType parse_interpolation_type(str interpolation_type) except *:
+
+    if interpolation_type == 'linear':
+        return INTERPOLATION_LINEAR
+    if interpolation_type == 'cubic':
+        return INTERPOLATION_CUBIC
+    raise ValueError("The interpolation type must be 'linear' or 'cubic'.")
+
+
+cdef ExtrapolationType parse_extrapolation_type(str extrapolation_type) except *:
+
+    if extrapolation_type == 'none':
+        return EXTRAPOLATION_NONE
+    if extrapolation_type == 'nearest':
+        return EXTRAPOLATION_NEAREST
+    if extrapolation_type == 'linear':
+        return EXTRAPOLATION_LINEAR
+    raise ValueError("The extrapolation type must be 'none', 'nearest' or 'linear'.")
@@ -0,0 +1,130 @@
+# cython: language_level=3
+
+# Copyright (c) 2014-2020, Dr Alex Meakins, Raysect Project
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#     1. Redistributions of source code must retain the above copyright notice,
+#        this list of conditions and the following disclaimer.
+#
+#     2. Redistributions in binary form must reproduce the above copyright
+#        notice, this list of conditions and the following disclaimer in the
+#        documentation and/or other materials provided with the distribution.
+#
+#     3. Neither the name of the Raysect Project nor the names of its
+#        contributors may be used to endorse or promote products derived from
+#        this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+import numpy as np
+cimport numpy as np
+from raysect.core.math.function.float.function1d.base cimport Function1D
+from raysect.core.math.function.float.function1d.interpolate.common cimport GridAxis
+cimport cython
+
+
+cdef class Interpolator1DArray(Function1D):
+    """
+    Interpolator for data sampled on a 1D grid.
+
+    The data is specified as an array of function values, f, sampled at an
+    array of strictly increasing coordinates, x. The coordinates need not be
+    uniformly spaced, however the interpolator is fastest if they are.
+
+    Two interpolation types are available:
+
+    * 'linear': linear interpolation between the neighbouring points.
+    * 'cubic': a cubic Hermite spline, with the gradient at each point estimated
+      from the neighbouring points. The interpolated values and gradients are
+      continuous.
+
+    Requesting a value outside the range of the coordinates raises a ValueError
+    exception unless an extrapolation type is specified:
+
+    * 'none': extrapolation is not performed (default).
+    * 'nearest': the value of the nearest point is returned.
+    * 'linear': the function is extended linearly from the edge of the grid.
+
+    Extrapolation is only permitted within the extrapolation_range of the grid
+    edges, beyond this a ValueError exception is raised.
+
+    :param object x: A 1D array of strictly increasing coordinates, containing at least two values.
+    :param object f: A 1D array of function values at the coordinates.
+    :param str interpolation_type: The interpolation type, 'linear' or 'cubic' (default='linear').
+    :param str extrapolation_type: The extrapolation type, 'none', 'nearest' or 'linear' (default='none').
+    :param float extrapolation_range: The maximum distance beyond the grid edges at which extrapolation
+      is permitted (default=infinity).
+
+    .. code-block:: pycon
+
+        >>> from raysect.core.math.function.float import Interpolator1DArray
+        >>>
+        >>> f = Interpolator1DArray([0, 1, 2, 3], [0, 1, 4, 9], 'cubic', 'linear', 1.0)
+        >>> f(1.5)
+        2.25
+    """
+
+    def __init__(self, object x not None, object f not None, str interpolation_type='linear',
+                 str extrapolation_type='none', double extrapolation_range=float('inf')):
+
+        self._x = GridAxis(x, interpolation_type, extrapolation_type, extrapolation_range, 'x')
+
+        # use numpy arrays to store data internally
+        f = np.array(f, dtype=np.float64)
+        if f.shape != (self._x.coordinates.shape[0], ):
+            raise ValueError("The shape of the function data ({}) does not match the number of x coordinates ({}).".format(f.shape, self._x.coordinates.shape[0]))
+
+        self._f = f
+        self._f_mv = f
+        self.interpolation_type = interpolation_type
+        self.extrapolation_type = extrapolation_type
+        self.extrapolation_range = extrapolation_range
+
+    def __reduce__(self):
+        return self.__class__, (self._x.coordinates, self._f, self.interpolation_type, self.extrapolation_type, self.extrapolation_range)
+
+    @property
+    def x(self):
+        """
+        The grid coordinates.
+
+        :rtype: ndarray
+        """
+        return self._x.coordinates.copy()
+
+    @property
+    def f(self):
+        """
+        The function values at the grid coordinates.
+
+        :rtype: ndarray
+        """
+        return self._f.copy()
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    @cython.initializedcheck(False)
+    cdef double evaluate(self, double x) except? -1e999:
+
+        cdef:
+            double wx[4]
+            int fx, nx, i
+            double value = 0
+
+        nx = self._x.weights(x, wx, &fx)
+        for i in range(nx):
+            value += wx[i] * self._f_mv[fx + i]
+        return value
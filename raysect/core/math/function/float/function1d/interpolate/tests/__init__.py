@@ -0,0 +1 @@
+from .test_interpolator1darray import *
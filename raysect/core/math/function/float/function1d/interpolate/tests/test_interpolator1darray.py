@@ -0,0 +1,141 @@
+# Copyright (c) 2014-2020, Dr Alex Meakins, Raysect Project
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#     1. Redistributions of source code must retain the above copyright notice,
+#        this list of conditions and the following disclaimer.
+#
+#     2. Redistributions in binary form must reproduce the above copyright
+#        notice, this list of conditions and the following disclaimer in the
+#        documentation and/or other materials provided with the distribution.
+#
+#     3. Neither the name of the Raysect Project nor the names of its
+#        contributors may be used to endorse or promote products derived from
+#        this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Unit tests for the Interpolator1DArray class.
+"""
+
+import pickle
+import unittest
+import numpy as np
+from raysect.core.math.function.float.function1d.interpolate import Interpolator1DArray
+
+
+class TestInterpolator1DArray(unittest.TestCase):
+
+    def setUp(self):
+
+        self.uniform = np.linspace(-2, 3, 11)
+        self.nonuniform = np.array([-2.0, -1.7, -0.9, 0.0, 0.15, 0.8, 1.9, 2.2, 3.0])
+        self.samples = np.linspace(-2, 3, 97)
+
+    def test_nodes(self):
+        for x in (self.uniform, self.nonuniform):
+            f = np.sin(x)
+            for interpolation in ('linear', 'cubic'):
+                interpolator = Interpolator1DArray(x, f, interpolation)
+                for xi, fi in zip(x, f):
+                    self.assertAlmostEqual(interpolator(xi), fi, places=14, msg="Interpolator did not return the data value at a grid point.")
+
+    def test_linear(self):
+        for x in (self.uniform, self.nonuniform):
+            f = np.cos(x)
+            interpolator = Interpolator1DArray(x, f, 'linear')
+            for v in self.samples:
+                self.assertAlmostEqual(interpolator(v), np.interp(v, x, f), places=12, msg="Linear interpolation did not match numpy.interp.")
+
+    def test_cubic(self):
+
+        # linear functions are reproduced on any grid
+        for x in (self.uniform, self.nonuniform):
+            interpolator = Interpolator1DArray(x, 3 * x - 1, 'cubic')
+            for v in self.samples:
+                self.assertAlmostEqual(interpolator(v), 3 * v - 1, places=12, msg="Cubic interpolation did not reproduce a linear function.")
+
+        # quadratic functions are reproduced away from the grid edges of a uniform grid
+        x = self.uniform
+        interpolator = Interpolator1DArray(x, x**2, 'cubic')
+        for v in np.linspace(x[1], x[-2], 53):
+            self.assertAlmostEqual(interpolator(v), v**2, places=12, msg="Cubic interpolation did not reproduce a quadratic function.")
+
+    def test_extrapolation(self):
+
+        x = self.nonuniform
+        f = 2 * x + 1
+
+        interpolator = Interpolator1DArray(x, f, 'cubic', 'none')
+        with self.assertRaises(ValueError, msg="Extrapolation was performed when disabled."):
+            interpolator(3.1)
+
+        interpolator = Interpolator1DArray(x, f, 'cubic', 'nearest', 1.0)
+        self.assertEqual(interpolator(-2.5), f[0])
+        self.assertEqual(interpolator(3.5), f[-1])
+
+        interpolator = Interpolator1DArray(x, f, 'linear', 'linear', 1.0)
+        self.assertAlmostEqual(interpolator(-2.5), -4.0, places=12)
+        self.assertAlmostEqual(interpolator(3.5), 8.0, places=12)
+
+        with self.assertRaises(ValueError, msg="Extrapolation was performed beyond the extrapolation range."):
+            interpolator(4.5)
+
+        with self.assertRaises(ValueError, msg="Extrapolation was performed beyond the extrapolation range."):
+            interpolator(-3.5)
+
+    def test_uniform_lookup(self):
+
+        # values at and between the grid points of a uniform grid must be located in the correct cell
+        x = np.linspace(0, 1, 101)
+        f = np.arange(101) % 2
+        interpolator = Interpolator1DArray(x, f, 'linear')
+        for i in range(100):
+            self.assertAlmostEqual(interpolator(x[i]), f[i], places=14)
+            self.assertAlmostEqual(interpolator(0.5 * (x[i] + x[i + 1])), 0.5, places=12)
+
+    def test_invalid(self):
+
+        with self.assertRaises(ValueError):
+            Interpolator1DArray([0, 1, 1, 2], [0, 1, 2, 3])
+
+        with self.assertRaises(ValueError):
+            Interpolator1DArray([0], [0])
+
+        with self.assertRaises(ValueError):
+            Interpolator1DArray([0, 1, 2], [0, 1])
+
+        with self.assertRaises(ValueError):
+            Interpolator1DArray([0, 1, 2], [0, 1, 2], 'quintic')
+
+        with self.assertRaises(ValueError):
+            Interpolator1DArray([0, 1, 2], [0, 1, 2], 'linear', 'quadratic')
+
+        with self.assertRaises(ValueError):
+            Interpolator1DArray([0, 1, 2], [0, 1, 2], 'linear', 'linear', -1)
+
+    def test_pickle(self):
+        interpolator = Interpolator1DArray(self.nonuniform, np.sin(self.nonuniform), 'cubic', 'linear', 0.5)
+        restored = pickle.loads(pickle.dumps(interpolator))
+        self.assertEqual(restored.interpolation_type, 'cubic')
+        self.assertEqual(restored.extrapolation_type, 'linear')
+        self.assertEqual(restored.extrapolation_range, 0.5)
+        for v in np.linspace(-2.4, 3.4, 17):
+            self.assertEqual(restored(v), interpolator(v))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -33,6 +33,7 @@ Unit tests for the Function1D class.
 
 import math
 import unittest
+import numpy as np
 from raysect.core.math.function.float.function1d.autowrap import PythonFunction1D
 
 # TODO: expand tests to cover the cython interface
@@ -51,6 +52,29 @@ class TestFunction1D(unittest.TestCase):
         for x in v:
             self.assertEqual(self.f1(x), self.ref1(x), "Function1D call did not match reference function value.")
 
+    def test_evaluate_array(self):
+        x = np.linspace(-5, 5, 11)
+        r = 2 * self.f1 + self.f2 / 4
+        result = r.evaluate_array(x)
+        self.assertEqual(result.shape, x.shape)
+        for i, v in enumerate(x):
+            self.assertEqual(result[i], r(v), "Function1D evaluate_array did not match the scalar call.")
+
+    def test_evaluate_array_out(self):
+        x = np.linspace(-5, 5, 6).reshape(2, 3)
+        out = np.empty((2, 3))
+        self.assertIs(self.f2.evaluate_array(x, out=out), out, "Function1D evaluate_array did not return the output array.")
+        np.testing.assert_array_equal(out, x * x)
+        with self.assertRaises(ValueError, msg="Function1D evaluate_array accepted an output array with an incorrect shape."):
+            self.f2.evaluate_array(x, out=np.empty(6))
+        with self.assertRaises(ValueError, msg="Function1D evaluate_array accepted an output array with an incorrect type."):
+            self.f2.evaluate_array(x, out=np.empty((2, 3), dtype=np.float32))
+
+    def test_evaluate_array_exception(self):
+        r = self.f1 / self.f1
+        with self.assertRaises(ZeroDivisionError, msg="Function1D evaluate_array did not propagate an exception."):
+            r.evaluate_array([1.0, 0.0, 2.0])
+
     def test_negate(self):
         v = [-1e10, -7, -0.001, 0.0, 0.00003, 10, 2.3e49]
         r = -self.f1
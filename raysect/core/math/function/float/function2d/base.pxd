@@ -37,6 +37,8 @@ cdef class Function2D(FloatFunction):
 
     cdef double evaluate(self, double x, double y) except? -1e999
 
+    cdef int _evaluate_array(self, const double[::1] x, const double[::1] y, double[::1] out) except -1
+
 
 cdef class AddFunction2D(Function2D):
     cdef Function2D _function1, _function2
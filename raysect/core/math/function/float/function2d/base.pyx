@@ -33,6 +33,7 @@ import numbers
 from cpython.object cimport Py_LT, Py_EQ, Py_GT, Py_LE, Py_NE, Py_GE
 cimport cython
 from libc.math cimport floor
+from raysect.core.math.function.float.base cimport prepare_array_evaluation
 from .autowrap cimport autowrap_function2d
 
 
@@ -54,6 +55,44 @@ cdef class Function2D(FloatFunction):
     cdef double evaluate(self, double x, double y) except? -1e999:
         raise NotImplementedError("The evaluate() method has not been implemented.")
 
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    @cython.initializedcheck(False)
+    cdef int _evaluate_array(self, const double[::1] x, const double[::1] y, double[::1] out) except -1:
+        """
+        Evaluates the function for each element of the coordinate arrays.
+
+        This method may be overridden by derived classes that can evaluate an
+        array of points more efficiently than repeated calls to evaluate().
+        """
+
+        cdef Py_ssize_t i
+
+        for i in range(out.shape[0]):
+            out[i] = self.evaluate(x[i], y[i])
+        return 0
+
+    def evaluate_array(self, x, y, out=None):
+        """
+        Evaluates the function at an array of points.
+
+        The coordinate arrays are broadcast against each other, following the
+        numpy broadcasting rules. The function is evaluated for each point in a
+        compiled loop, avoiding the overhead of a python call per point. This
+        applies to the functions produced by arithmetic on function objects.
+
+        :param x: Array of x coordinates.
+        :param y: Array of y coordinates.
+        :param ndarray out: Optional writeable, C contiguous float64 array with the broadcast
+          shape of the coordinates, that will hold the results.
+        :return: Array of function values.
+        :rtype: ndarray
+        """
+
+        out, values, xv, yv = prepare_array_evaluation((x, y), out)
+        self._evaluate_array(xv, yv, values)
+        return out
+
     def __call__(self, double x, double y):
         """ Evaluate the function f(x, y)
 
@@ -31,3 +31,4 @@
 
 from .interpolator2dmesh import Interpolator2DMesh
 from .discrete2dmesh import Discrete2DMesh
+from .interpolator2darray import Interpolator2DArray
@@ -39,8 +39,10 @@ cdef class MeshKDTree2D(KDTree2DCore):
     cdef:
         np.ndarray _vertices
         np.ndarray _triangles
+        np.ndarray _neighbours
         double[:, ::1] _vertices_mv
         np.int32_t[:, ::1] _triangles_mv
+        np.int32_t[:, ::1] _neighbours_mv
         np.int32_t triangle_id
         np.int32_t i1, i2, i3
         double alpha, beta, gamma
@@ -48,5 +50,11 @@ cdef class MeshKDTree2D(KDTree2DCore):
         double _cached_x
         double _cached_y
         bint _cached_result
+        np.int32_t _last_triangle
+        np.int32_t _walk_backoff
 
-    cdef BoundingBox2D _generate_bounding_box(self, np.int32_t triangle)
\ No newline at end of file
+    cdef BoundingBox2D _generate_bounding_box(self, np.int32_t triangle)
+
+    cdef bint _test_triangle(self, np.int32_t triangle, double x, double y, double *alpha, double *beta, double *gamma)
+
+    cdef bint _locate(self, double x, double y)
@@ -48,8 +48,31 @@ DEF V3 = 2
 DEF X = 0
 DEF Y = 1
 
+# no cached triangle / no neighbouring triangle
+DEF NO_TRIANGLE = -1
+
+# maximum number of steps taken by the walking search before falling back to the kd-tree
+DEF MAX_WALK_STEPS = 2
+
+# number of look-ups that skip the walking search after it has failed
+DEF WALK_BACKOFF = 16
+
 
 cdef class MeshKDTree2D(KDTree2DCore):
+    """
+    A kd-tree for locating the triangle of a mesh enclosing a point.
+
+    In addition to the kd-tree, the edge adjacency of the triangles is computed
+    at construction. The last triangle found to contain a point is remembered
+    and subsequent look-ups start by walking across the mesh from that
+    triangle towards the point. Consecutive look-ups along a line of sight are
+    spatially coherent, so the walk usually succeeds within a step or two. The
+    kd-tree is only traversed if the walk leaves the mesh or exceeds a couple
+    of steps.
+
+    :param ndarray vertices: An array of vertex coordinates (x, y) with shape Nx2.
+    :param ndarray triangles: An array of vertex indices defining the mesh triangles, with shape Mx3.
+    """
 
     def __init__(self, object vertices not None, object triangles not None):
 
@@ -71,10 +94,12 @@ cdef class MeshKDTree2D(KDTree2DCore):
         # assign to internal attributes
         self._vertices = vertices
         self._triangles = triangles
+        self._neighbours = _edge_neighbours(triangles)
 
         # assign to memory views
         self._vertices_mv = vertices
         self._triangles_mv = triangles
+        self._neighbours_mv = self._neighbours
 
         # initialise hit state attributes
         self.triangle_id = -1
@@ -99,6 +124,8 @@ cdef class MeshKDTree2D(KDTree2DCore):
         self._cached_x = 0.0
         self._cached_y = 0.0
         self._cached_result = False
+        self._last_triangle = NO_TRIANGLE
+        self._walk_backoff = 0
 
     def __getstate__(self):
         return self._triangles, self._vertices, super().__getstate__()
@@ -108,9 +135,11 @@ cdef class MeshKDTree2D(KDTree2DCore):
         self._triangles, self._vertices, super_state = state
         super().__setstate__(super_state)
 
-        # rebuild memory views
+        # rebuild adjacency and memory views
+        self._neighbours = _edge_neighbours(self._triangles)
         self._vertices_mv = self._vertices
         self._triangles_mv = self._triangles
+        self._neighbours_mv = self._neighbours
 
         # initialise hit state attributes
         self.triangle_id = -1
@@ -126,10 +155,23 @@ cdef class MeshKDTree2D(KDTree2DCore):
         self._cached_x = 0.0
         self._cached_y = 0.0
         self._cached_result = False
+        self._last_triangle = NO_TRIANGLE
+        self._walk_backoff = 0
 
     def __reduce__(self):
         return self.__new__, (self.__class__, ), self.__getstate__()
 
+    @property
+    def neighbours(self):
+        """
+        The edge adjacency of the mesh triangles as an Mx3 array.
+
+        Element [i, j] is the index of the triangle sharing the edge of
+        triangle i opposite its j-th vertex, or -1 if the edge lies on the
+        mesh boundary.
+        """
+        return self._neighbours.copy()
+
     @cython.boundscheck(False)
     @cython.wraparound(False)
     @cython.initializedcheck(False)
@@ -173,39 +215,136 @@ cdef class MeshKDTree2D(KDTree2DCore):
     @cython.boundscheck(False)
     @cython.wraparound(False)
     @cython.initializedcheck(False)
-    cdef bint _is_contained_leaf(self, np.int32_t id, Point2D point):
+    @cython.final
+    cdef bint _test_triangle(self, np.int32_t triangle, double x, double y, double *alpha, double *beta, double *gamma):
+        """
+        Tests if a triangle contains the point, recording the hit state if it does.
+
+        The barycentric coordinates of the point are always returned, even if
+        the point lies outside the triangle.
+
+        :param triangle: Triangle array index.
+        :param x: x coordinate of the point.
+        :param y: y coordinate of the point.
+        :param alpha: Returned barycentric coordinate alpha.
+        :param beta: Returned barycentric coordinate beta.
+        :param gamma: Returned barycentric coordinate gamma.
+        :return: True if the triangle contains the point, False otherwise.
+        """
+
+        cdef np.int32_t i1, i2, i3
+
+        # obtain vertex indices
+        i1 = self._triangles_mv[triangle, V1]
+        i2 = self._triangles_mv[triangle, V2]
+        i3 = self._triangles_mv[triangle, V3]
+
+        barycentric_coords(self._vertices_mv[i1, X], self._vertices_mv[i1, Y],
+                           self._vertices_mv[i2, X], self._vertices_mv[i2, Y],
+                           self._vertices_mv[i3, X], self._vertices_mv[i3, Y],
+                           x, y, alpha, beta, gamma)
+
+        if not barycentric_inside_triangle(alpha[0], beta[0], gamma[0]):
+            return False
+
+        # store id of triangle hit
+        self.triangle_id = triangle
+        self._last_triangle = triangle
+
+        # store vertex indices and barycentric coords
+        self.i1 = i1
+        self.i2 = i2
+        self.i3 = i3
+        self.alpha = alpha[0]
+        self.beta = beta[0]
+        self.gamma = gamma[0]
+
+        return True
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    @cython.initializedcheck(False)
+    cdef bint _locate(self, double x, double y):
+        """
+        Identifies the triangle containing the point.
+
+        Starting from the last triangle hit, the search walks across the mesh,
+        stepping over the edge opposite the most negative barycentric
+        coordinate until the enclosing triangle is found. If the walk reaches
+        the mesh boundary or takes too many steps, the kd-tree is searched and
+        the walk is skipped for the next few look-ups. This bounds the cost
+        added to spatially incoherent look-ups.
+
+        The result for the last point is cached. As the hit state is only
+        modified by this method, a repeated look-up of the same point returns
+        the cached result with the hit state still valid.
+
+        :param x: x coordinate of the point.
+        :param y: y coordinate of the point.
+        :return: True if the point lies inside the mesh, False otherwise.
+        """
 
         cdef:
-            np.int32_t index, triangle, i1, i2, i3
+            np.int32_t triangle, step
             double alpha, beta, gamma
+            bint result
 
-        # identify the first triangle that contains the point, if any
-        for index in range(self._nodes[id].count):
+        if self._cache_available and x == self._cached_x and y == self._cached_y:
+            return self._cached_result
+
+        result = False
+        triangle = self._last_triangle
+
+        if self._walk_backoff > 0:
+
+            # a recent walk failed, the look-ups are probably incoherent
+            self._walk_backoff -= 1
+
+        elif triangle != NO_TRIANGLE:
+
+            for step in range(MAX_WALK_STEPS + 1):
+
+                if self._test_triangle(triangle, x, y, &alpha, &beta, &gamma):
+                    result = True
+                    break
 
-            # obtain vertex indices
-            triangle = self._nodes[id].items[index]
-            i1 = self._triangles_mv[triangle, V1]
-            i2 = self._triangles_mv[triangle, V2]
-            i3 = self._triangles_mv[triangle, V3]
+                # step towards the point
+                if alpha <= beta and alpha <= gamma:
+                    triangle = self._neighbours_mv[triangle, V1]
+                elif beta <= gamma:
+                    triangle = self._neighbours_mv[triangle, V2]
+                else:
+                    triangle = self._neighbours_mv[triangle, V3]
 
-            barycentric_coords(self._vertices_mv[i1, X], self._vertices_mv[i1, Y],
-                               self._vertices_mv[i2, X], self._vertices_mv[i2, Y],
-                               self._vertices_mv[i3, X], self._vertices_mv[i3, Y],
-                               point.x, point.y, &alpha, &beta, &gamma)
+                if triangle == NO_TRIANGLE:
+                    break
 
-            if barycentric_inside_triangle(alpha, beta, gamma):
+            if not result:
+                self._walk_backoff = WALK_BACKOFF
 
-                # store id of triangle hit
-                self.triangle_id = triangle
+        if not result:
+            result = self._is_contained(new_point2d(x, y))
+
+        # update cache
+        self._cache_available = True
+        self._cached_x = x
+        self._cached_y = y
+        self._cached_result = result
+
+        return result
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    @cython.initializedcheck(False)
+    cdef bint _is_contained_leaf(self, np.int32_t id, Point2D point):
 
-                # store vertex indices and barycentric coords
-                self.i1 = i1
-                self.i2 = i2
-                self.i3 = i3
-                self.alpha = alpha
-                self.beta = beta
-                self.gamma = gamma
+        cdef:
+            np.int32_t index
+            double alpha, beta, gamma
 
+        # identify the first triangle that contains the point, if any
+        for index in range(self._nodes[id].count):
+            if self._test_triangle(self._nodes[id].items[index], point.x, point.y, &alpha, &beta, &gamma):
                 return True
 
         return False
@@ -217,17 +356,40 @@ cdef class MeshKDTree2D(KDTree2DCore):
         :return: True if the point lies inside an item, false otherwise.
         """
 
-        cdef bint result
+        return self._locate(point.x, point.y)
 
-        if self._cache_available and point.x == self._cached_x and point.y == self._cached_y:
-            return self._cached_result
 
-        result = self._is_contained(point)
+def _edge_neighbours(np.ndarray triangles):
+    """
+    Computes the edge adjacency of a set of triangles.
 
-        # add cache
-        self._cache_available = True
-        self._cached_x = point.x
-        self._cached_y = point.y
-        self._cached_result = result
+    The edges of every triangle are sorted so that an edge shared by two
+    triangles has an identical key. Sorting the keys brings the shared edges
+    together, which are then linked in a single vectorised pass.
 
-        return result
+    :param triangles: An array of vertex indices with shape Mx3.
+    :return: An Mx3 int32 array of neighbour indices, -1 for boundary edges.
+    """
+
+    cdef:
+        np.npy_intp count = triangles.shape[0]
+
+    neighbours = np.full((count, 3), NO_TRIANGLE, dtype=np.int32)
+    if count == 0:
+        return neighbours
+
+    # edge j of a triangle is the edge opposite vertex j
+    edges = np.concatenate([np.sort(np.delete(triangles, j, axis=1), axis=1) for j in range(3)])
+    owners = np.tile(np.arange(count, dtype=np.int32), 3)
+    slots = np.repeat(np.arange(3, dtype=np.int32), count)
+
+    order = np.lexsort((edges[:, 1], edges[:, 0]))
+    edges = edges[order]
+    shared = np.nonzero(np.all(edges[1:] == edges[:-1], axis=1))[0]
+
+    a = order[shared]
+    b = order[shared + 1]
+    neighbours[owners[a], slots[a]] = owners[b]
+    neighbours[owners[b], slots[b]] = owners[a]
+
+    return neighbours
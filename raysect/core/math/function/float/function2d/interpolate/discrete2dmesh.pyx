@@ -32,7 +32,6 @@
 import numpy as np
 cimport numpy as np
 from raysect.core.math.function.float.function2d cimport Function2D
-from raysect.core.math.point cimport new_point2d
 cimport cython
 
 
@@ -170,7 +169,7 @@ cdef class Discrete2DMesh(Function2D):
         cdef:
             np.int32_t triangle_id
 
-        if self._kdtree.is_contained(new_point2d(x, y)):
+        if self._kdtree._locate(x, y):
             triangle_id = self._kdtree.triangle_id
             return self._triangle_data_mv[triangle_id]
 
@@ -0,0 +1,138 @@
+# cython: language_level=3
+
+# Copyright (c) 2014-2020, Dr Alex Meakins, Raysect Project
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#     1. Redistributions of source code must retain the above copyright notice,
+#        this list of conditions and the following disclaimer.
+#
+#     2. Redistributions in binary form must reproduce the above copyright
+#        notice, this list of conditions and the following disclaimer in the
+#        documentation and/or other materials provided with the distribution.
+#
+#     3. Neither the name of the Raysect Project nor the names of its
+#        contributors may be used to endorse or promote products derived from
+#        this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+import numpy as np
+cimport numpy as np
+from raysect.core.math.function.float.function2d.base cimport Function2D
+from raysect.core.math.function.float.function1d.interpolate.common cimport GridAxis
+cimport cython
+
+
+cdef class Interpolator2DArray(Function2D):
+    """
+    Interpolator for data sampled on a 2D rectilinear grid.
+
+    The data is specified as a 2D array of function values, f, with shape
+    (Nx, Ny), sampled at the points of a grid defined by 1D arrays of strictly
+    increasing coordinates along each axis. The coordinates need not be
+    uniformly spaced, however the interpolator is fastest if they are.
+
+    The interpolation and extrapolation are performed independently along each
+    axis, see Interpolator1DArray for a description of the interpolation and
+    extrapolation types. Extrapolation is only permitted within the
+    extrapolation_range of the grid edges, beyond this a ValueError exception
+    is raised.
+
+    :param object x: A 1D array of strictly increasing x coordinates, containing at least two values.
+    :param object y: A 1D array of strictly increasing y coordinates, containing at least two values.
+    :param object f: A 2D array of function values at the grid points, with shape (Nx, Ny).
+    :param str interpolation_type: The interpolation type, 'linear' or 'cubic' (default='linear').
+    :param str extrapolation_type: The extrapolation type, 'none', 'nearest' or 'linear' (default='none').
+    :param float extrapolation_range: The maximum distance beyond the grid edges at which extrapolation
+      is permitted (default=infinity).
+
+    .. code-block:: pycon
+
+        >>> from raysect.core.math.function.float import Interpolator2DArray
+        >>>
+        >>> x = [0, 1, 2]
+        >>> y = [0, 1]
+        >>> f = [[0, 1], [2, 3], [4, 5]]
+        >>> interpolator = Interpolator2DArray(x, y, f, 'linear', 'nearest', 0.5)
+        >>> interpolator(0.5, 0.5)
+        1.5
+    """
+
+    def __init__(self, object x not None, object y not None, object f not None, str interpolation_type='linear',
+                 str extrapolation_type='none', double extrapolation_range=float('inf')):
+
+        self._x = GridAxis(x, interpolation_type, extrapolation_type, extrapolation_range, 'x')
+        self._y = GridAxis(y, interpolation_type, extrapolation_type, extrapolation_range, 'y')
+
+        # use numpy arrays to store data internally
+        f = np.array(f, dtype=np.float64)
+        shape = (self._x.coordinates.shape[0], self._y.coordinates.shape[0])
+        if f.shape != shape:
+            raise ValueError("The shape of the function data ({}) does not match the shape of the grid ({}).".format(f.shape, shape))
+
+        self._f = f
+        self._f_mv = f
+        self.interpolation_type = interpolation_type
+        self.extrapolation_type = extrapolation_type
+        self.extrapolation_range = extrapolation_range
+
+    def __reduce__(self):
+        return self.__class__, (self._x.coordinates, self._y.coordinates, self._f, self.interpolation_type, self.extrapolation_type, self.extrapolation_range)
+
+    @property
+    def x(self):
+        """
+        The grid x coordinates.
+
+        :rtype: ndarray
+        """
+        return self._x.coordinates.copy()
+
+    @property
+    def y(self):
+        """
+        The grid y coordinates.
+
+        :rtype: ndarray
+        """
+        return self._y.coordinates.copy()
+
+    @property
+    def f(self):
+        """
+        The function values at the grid points.
+
+        :rtype: ndarray
+        """
+        return self._f.copy()
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    @cython.initializedcheck(False)
+    cdef double evaluate(self, double x, double y) except? -1e999:
+
+        cdef:
+            double wx[4]
+            double wy[4]
+            int fx, nx, i, fy, ny, j
+            double value = 0
+
+        nx = self._x.weights(x, wx, &fx)
+        ny = self._y.weights(y, wy, &fy)
+        for i in range(nx):
+            for j in range(ny):
+                value += wx[i] * wy[j] * self._f_mv[fx + i, fy + j]
+        return value
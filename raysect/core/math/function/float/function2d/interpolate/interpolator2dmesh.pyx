@@ -32,7 +32,6 @@
 import numpy as np
 cimport numpy as np
 from raysect.core.math.function.float.function2d cimport Function2D
-from raysect.core.math.point cimport new_point2d
 from raysect.core.math.cython cimport barycentric_interpolation
 cimport cython
 
@@ -59,6 +58,11 @@ cdef class Interpolator2DMesh(Function2D):
     return can be specified by setting the default_value attribute (default is
     0.0).
 
+    Successive look-ups are accelerated by walking across the mesh from the
+    last triangle hit, using triangle adjacency computed at construction. The
+    KD-Tree described below is only searched if the walk fails to find the
+    enclosing triangle within a few steps.
+
     To optimise the lookup of triangles, the interpolator builds an
     acceleration structure (a KD-Tree) from the specified mesh data. Depending
     on the size of the mesh, this can be quite slow to construct. If the user
@@ -172,7 +176,7 @@ cdef class Interpolator2DMesh(Function2D):
             np.int32_t i1, i2, i3
             double alpha, beta, gamma
 
-        if self._kdtree.is_contained(new_point2d(x, y)):
+        if self._kdtree._locate(x, y):
 
             # obtain hit data from kdtree attributes
             i1 = self._kdtree.i1
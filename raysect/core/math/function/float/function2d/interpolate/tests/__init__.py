@@ -0,0 +1,2 @@
+from .test_interpolator2darray import *
+from .test_interpolator2dmesh import *
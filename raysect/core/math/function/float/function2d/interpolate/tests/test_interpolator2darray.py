@@ -0,0 +1,116 @@
+# Copyright (c) 2014-2020, Dr Alex Meakins, Raysect Project
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#     1. Redistributions of source code must retain the above copyright notice,
+#        this list of conditions and the following disclaimer.
+#
+#     2. Redistributions in binary form must reproduce the above copyright
+#        notice, this list of conditions and the following disclaimer in the
+#        documentation and/or other materials provided with the distribution.
+#
+#     3. Neither the name of the Raysect Project nor the names of its
+#        contributors may be used to endorse or promote products derived from
+#        this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Unit tests for the Interpolator2DArray class.
+"""
+
+import pickle
+import unittest
+import numpy as np
+from raysect.core.math.function.float.function2d.interpolate import Interpolator2DArray
+
+
+class TestInterpolator2DArray(unittest.TestCase):
+
+    def setUp(self):
+
+        self.x = np.array([-1.0, -0.6, 0.1, 0.5, 1.2, 2.0])
+        self.y = np.linspace(0, 3, 7)
+        self.points = [(x, y) for x in np.linspace(-1, 2, 13) for y in np.linspace(0, 3, 11)]
+
+    def grid(self, function):
+        return function(self.x[:, None], self.y[None, :])
+
+    def test_bilinear(self):
+
+        # bilinear functions are reproduced exactly by both interpolation types
+        function = lambda x, y: 1 + 2 * x - 3 * y + 0.5 * x * y
+        for interpolation in ('linear', 'cubic'):
+            interpolator = Interpolator2DArray(self.x, self.y, self.grid(function), interpolation)
+            for x, y in self.points:
+                self.assertAlmostEqual(interpolator(x, y), function(x, y), places=12,
+                                       msg="Interpolation did not reproduce a bilinear function.")
+
+    def test_cubic(self):
+
+        # quadratic functions are reproduced away from the grid edges of a uniform grid
+        x = np.linspace(-1, 1, 9)
+        y = np.linspace(0, 2, 9)
+        function = lambda x, y: x**2 - 2 * x * y + 0.5 * y**2
+        interpolator = Interpolator2DArray(x, y, function(x[:, None], y[None, :]), 'cubic')
+        for vx in np.linspace(x[1], x[-2], 11):
+            for vy in np.linspace(y[1], y[-2], 11):
+                self.assertAlmostEqual(interpolator(vx, vy), function(vx, vy), places=12,
+                                       msg="Cubic interpolation did not reproduce a quadratic function.")
+
+    def test_extrapolation(self):
+
+        function = lambda x, y: 1 + 2 * x - 3 * y
+        f = self.grid(function)
+
+        interpolator = Interpolator2DArray(self.x, self.y, f)
+        with self.assertRaises(ValueError):
+            interpolator(0, 3.5)
+
+        interpolator = Interpolator2DArray(self.x, self.y, f, 'cubic', 'nearest')
+        self.assertAlmostEqual(interpolator(-2, 1.5), function(-1, 1.5), places=12)
+        self.assertAlmostEqual(interpolator(3, 4), function(2, 3), places=12)
+
+        interpolator = Interpolator2DArray(self.x, self.y, f, 'linear', 'linear', 1.0)
+        self.assertAlmostEqual(interpolator(-1.5, 3.5), function(-1.5, 3.5), places=12)
+        with self.assertRaises(ValueError):
+            interpolator(-2.5, 0)
+
+    def test_evaluate_array(self):
+        interpolator = Interpolator2DArray(self.x, self.y, self.grid(lambda x, y: np.sin(x) * y), 'cubic')
+        x = np.linspace(-1, 2, 5)
+        y = np.linspace(0, 3, 4)
+        result = interpolator.evaluate_array(x[:, None], y[None, :])
+        for i, vx in enumerate(x):
+            for j, vy in enumerate(y):
+                self.assertEqual(result[i, j], interpolator(vx, vy))
+
+    def test_invalid(self):
+
+        with self.assertRaises(ValueError):
+            Interpolator2DArray(self.x, self.y, np.zeros((6, 6)))
+
+        with self.assertRaises(ValueError):
+            Interpolator2DArray(self.x[::-1], self.y, np.zeros((6, 7)))
+
+    def test_pickle(self):
+        interpolator = Interpolator2DArray(self.x, self.y, self.grid(lambda x, y: np.cos(x + y)), 'cubic', 'nearest', 0.5)
+        restored = pickle.loads(pickle.dumps(interpolator))
+        for x, y in self.points:
+            self.assertEqual(restored(x, y), interpolator(x, y))
+
+
+if __name__ == "__main__":
+    unittest.main()
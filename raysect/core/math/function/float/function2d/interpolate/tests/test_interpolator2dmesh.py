@@ -0,0 +1,192 @@
+# Copyright (c) 2014-2020, Dr Alex Meakins, Raysect Project
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#     1. Redistributions of source code must retain the above copyright notice,
+#        this list of conditions and the following disclaimer.
+#
+#     2. Redistributions in binary form must reproduce the above copyright
+#        notice, this list of conditions and the following disclaimer in the
+#        documentation and/or other materials provided with the distribution.
+#
+#     3. Neither the name of the Raysect Project nor the names of its
+#        contributors may be used to endorse or promote products derived from
+#        this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Unit tests for the Interpolator2DMesh and Discrete2DMesh classes.
+"""
+
+import pickle
+import unittest
+import numpy as np
+from raysect.core.math.function.float.function2d.interpolate import Interpolator2DMesh, Discrete2DMesh
+from raysect.core.math.function.float.function2d.interpolate.common import MeshKDTree2D
+from raysect.core.math import Point2D
+
+
+def _generate_mesh(n, hole=False):
+    """
+    Generates a triangular mesh of the square [-1, 1] x [0, 2].
+
+    Each of the n^2 cells is split into two triangles. If hole is True the
+    cells in the central quarter of the square are omitted.
+    """
+
+    axis = np.linspace(-1, 1, n + 1)
+    x, y = np.meshgrid(axis, axis + 1, indexing='ij')
+    vertices = np.stack((x.ravel(), y.ravel()), axis=1)
+
+    triangles = []
+    for i in range(n):
+        for j in range(n):
+            if hole and n // 4 <= i < 3 * n // 4 and n // 4 <= j < 3 * n // 4:
+                continue
+            v1 = i * (n + 1) + j
+            v2 = v1 + n + 1
+            triangles.append([v1, v2, v2 + 1])
+            triangles.append([v1, v2 + 1, v1 + 1])
+
+    return vertices, np.array(triangles, dtype=np.int32)
+
+
+def _linear(x, y):
+    return 0.5 - 2.0 * x + 3.0 * y
+
+
+class TestInterpolator2DMesh(unittest.TestCase):
+
+    def setUp(self):
+
+        self.vertices, self.triangles = _generate_mesh(8)
+        self.data = _linear(self.vertices[:, 0], self.vertices[:, 1])
+
+        rng = np.random.RandomState(1)
+        self.points = rng.uniform((-1, 0), (1, 2), size=(500, 2))
+
+    def test_neighbours(self):
+
+        tree = MeshKDTree2D(self.vertices, self.triangles)
+        neighbours = tree.neighbours
+
+        # 2 boundary edges per cell on each of the 4 sides of the square
+        self.assertEqual(neighbours.shape, (self.triangles.shape[0], 3))
+        self.assertEqual((neighbours == -1).sum(), 4 * 8)
+
+        for triangle, edges in enumerate(neighbours):
+            for edge, neighbour in enumerate(edges):
+                if neighbour == -1:
+                    continue
+
+                # adjacency must be symmetric and the shared edge must be the edge opposite the vertex
+                self.assertIn(triangle, neighbours[neighbour])
+                shared = set(self.triangles[triangle]) - {self.triangles[triangle, edge]}
+                self.assertTrue(shared.issubset(set(self.triangles[neighbour])))
+
+    def test_interpolation(self):
+
+        # a linear function is reproduced exactly by barycentric interpolation
+        interpolator = Interpolator2DMesh(self.vertices, self.data, self.triangles)
+        for x, y in self.points:
+            self.assertAlmostEqual(interpolator(x, y), _linear(x, y), places=12)
+
+    def test_coherent_queries(self):
+
+        # evaluations along a line exercise the walking search, the result must match
+        # a fresh interpolator for which every query requires a tree search
+        for hole in (False, True):
+            vertices, triangles = _generate_mesh(8, hole)
+            data = np.sin(vertices[:, 0]) * vertices[:, 1]
+            interpolator = Interpolator2DMesh(vertices, data, triangles, limit=False, default_value=-10.0)
+            for t in np.linspace(0, 1, 200):
+                x, y = -0.95 + 1.9 * t, 0.05 + 1.9 * t * t
+                fresh = Interpolator2DMesh(vertices, data, triangles, limit=False, default_value=-10.0)
+                self.assertAlmostEqual(interpolator(x, y), fresh(x, y), places=12)
+
+    def test_walk_across_hole(self):
+
+        # the walk from the last triangle is blocked by the hole, so the kd-tree must be searched
+        vertices, triangles = _generate_mesh(8, hole=True)
+        data = _linear(vertices[:, 0], vertices[:, 1])
+        interpolator = Interpolator2DMesh(vertices, data, triangles)
+        self.assertAlmostEqual(interpolator(-0.9, 1.0), _linear(-0.9, 1.0), places=12)
+        self.assertAlmostEqual(interpolator(0.9, 1.0), _linear(0.9, 1.0), places=12)
+        with self.assertRaises(ValueError):
+            interpolator(0.0, 1.0)
+
+    def test_repeated_queries(self):
+
+        # instances share the kd-tree, repeated and interleaved look-ups must not return a stale hit state
+        interpolator = Interpolator2DMesh(self.vertices, self.data, self.triangles)
+        instance = Interpolator2DMesh.instance(interpolator, vertex_data=2 * self.data)
+        (x1, y1), (x2, y2) = self.points[:2]
+        for x, y in ((x1, y1), (x1, y1), (x2, y2), (x1, y1), (x2, y2), (x2, y2)):
+            self.assertAlmostEqual(interpolator(x, y), _linear(x, y), places=12)
+            self.assertAlmostEqual(instance(x, y), 2 * _linear(x, y), places=12)
+
+        discrete = Discrete2DMesh(self.vertices, self.triangles, np.arange(self.triangles.shape[0], dtype=np.float64))
+        for x, y in ((x1, y1), (x2, y2), (x2, y2), (x1, y1)):
+            fresh = Discrete2DMesh(self.vertices, self.triangles, np.arange(self.triangles.shape[0], dtype=np.float64))
+            self.assertEqual(discrete(x, y), fresh(x, y))
+
+    def test_limits(self):
+
+        interpolator = Interpolator2DMesh(self.vertices, self.data, self.triangles)
+        interpolator(0.99, 1.0)
+        with self.assertRaises(ValueError):
+            interpolator(1.01, 1.0)
+
+    def test_pickle(self):
+
+        interpolator = Interpolator2DMesh(self.vertices, self.data, self.triangles)
+        restored = pickle.loads(pickle.dumps(interpolator))
+        for x, y in self.points[:50]:
+            self.assertEqual(restored(x, y), interpolator(x, y))
+
+
+class TestDiscrete2DMesh(unittest.TestCase):
+
+    def setUp(self):
+
+        self.vertices, self.triangles = _generate_mesh(6)
+        self.data = np.arange(self.triangles.shape[0], dtype=np.float64)
+
+        rng = np.random.RandomState(2)
+        self.points = rng.uniform((-1, 0), (1, 2), size=(300, 2))
+
+    def test_evaluate(self):
+
+        discrete = Discrete2DMesh(self.vertices, self.triangles, self.data)
+        for point in self.points:
+
+            triangle = self.triangles[int(discrete(*point))]
+
+            # the returned triangle must contain the point
+            v = self.vertices[triangle]
+            coords = np.linalg.solve((v[:2] - v[2]).T, point - v[2])
+            self.assertTrue(np.all(coords >= -1e-12) and coords.sum() <= 1 + 1e-12)
+
+    def test_kdtree_is_contained(self):
+
+        tree = MeshKDTree2D(self.vertices, self.triangles)
+        self.assertTrue(tree.is_contained(Point2D(0, 1)))
+        self.assertFalse(tree.is_contained(Point2D(0, 2.5)))
+        self.assertTrue(tree.is_contained(Point2D(0.5, 1.5)))
+
+
+if __name__ == "__main__":
+    unittest.main()
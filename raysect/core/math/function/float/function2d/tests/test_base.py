@@ -33,6 +33,7 @@ Unit tests for the Function2D class.
 
 import math
 import unittest
+import numpy as np
 from raysect.core.math.function.float.function2d.autowrap import PythonFunction2D
 
 # TODO: expand tests to cover the cython interface
@@ -52,6 +53,35 @@ class TestFunction2D(unittest.TestCase):
             for y in v:
                 self.assertEqual(self.f1(x, y), self.ref1(x, y), "Function2D call did not match reference function value.")
 
+    def test_evaluate_array(self):
+        x = np.linspace(-5, 5, 11)
+        y = np.linspace(-2, 3, 7)
+        r = 2 * self.f1 + self.f2 / 4
+
+        # coordinate arrays are broadcast
+        result = r.evaluate_array(x[:, None], y[None, :])
+        self.assertEqual(result.shape, (11, 7))
+        for i, vx in enumerate(x):
+            for j, vy in enumerate(y):
+                self.assertEqual(result[i, j], r(vx, vy), "Function2D evaluate_array did not match the scalar call.")
+
+        result = r.evaluate_array(x, 1.5)
+        for i, vx in enumerate(x):
+            self.assertEqual(result[i], r(vx, 1.5), "Function2D evaluate_array did not match the scalar call.")
+
+    def test_evaluate_array_out(self):
+        x = np.linspace(-5, 5, 6).reshape(2, 3)
+        out = np.empty((2, 3))
+        self.assertIs(self.f2.evaluate_array(x, x, out=out), out, "Function2D evaluate_array did not return the output array.")
+        np.testing.assert_array_equal(out, 2 * x * x)
+        with self.assertRaises(ValueError, msg="Function2D evaluate_array accepted an output array with an incorrect shape."):
+            self.f2.evaluate_array(x, x, out=np.empty(6))
+
+    def test_evaluate_array_exception(self):
+        r = self.f1 / self.f1
+        with self.assertRaises(ZeroDivisionError, msg="Function2D evaluate_array did not propagate an exception."):
+            r.evaluate_array([1.0, 0.0, 2.0], 0.0)
+
     def test_negate(self):
         v = [-1e10, -7, -0.001, 0.0, 0.00003, 10, 2.3e49]
         r = -self.f1
@@ -34,3 +34,5 @@ from raysect.core.math.function.float.function3d.constant cimport Constant3D
 from raysect.core.math.function.float.function3d.autowrap cimport autowrap_function3d
 from raysect.core.math.function.float.function3d.arg cimport Arg3D
 from raysect.core.math.function.float.function3d.cmath cimport *
+from raysect.core.math.function.float.function3d.compiled cimport CompiledFunction3D, compile_function3d
+from raysect.core.math.function.float.function3d.interpolate cimport *
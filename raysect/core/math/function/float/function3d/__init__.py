@@ -31,5 +31,7 @@
 
 from .base import Function3D
 from .constant import Constant3D
+from .interpolate import *
 from .arg import Arg3D
 from .cmath import *
+from .compiled import CompiledFunction3D, compile_function3d
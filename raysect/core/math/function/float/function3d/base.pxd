@@ -36,6 +36,8 @@ from raysect.core.math.function.float.base cimport FloatFunction
 cdef class Function3D(FloatFunction):
     cdef double evaluate(self, double x, double y, double z) except? -1e999
 
+    cdef int _evaluate_array(self, const double[::1] x, const double[::1] y, const double[::1] z, double[::1] out) except -1
+
 
 cdef class AddFunction3D(Function3D):
     cdef Function3D _function1, _function2
@@ -0,0 +1,561 @@
+# cython: language_level=3
+
+# Copyright (c) 2014-2020, Dr Alex Meakins, Raysect Project
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#     1. Redistributions of source code must retain the above copyright notice,
+#        this list of conditions and the following disclaimer.
+#
+#     2. Redistributions in binary form must reproduce the above copyright
+#        notice, this list of conditions and the following disclaimer in the
+#        documentation and/or other materials provided with the distribution.
+#
+#     3. Neither the name of the Raysect Project nor the names of its
+#        contributors may be used to endorse or promote products derived from
+#        this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+import numpy as np
+import struct
+cimport cython
+cimport libc.math as cmath
+from libc.math cimport floor
+from raysect.core.math.function.float.function3d.base cimport *
+from raysect.core.math.function.float.function3d.arg cimport Arg3D, ArgLabel, X, Y, Z
+from raysect.core.math.function.float.function3d.constant cimport Constant3D
+from raysect.core.math.function.float.function3d.cmath cimport *
+from raysect.core.math.function.float.function3d.autowrap cimport autowrap_function3d
+
+
+# operations where the order of the operands does not alter the result
+_COMMUTATIVE = {OP_ADD, OP_MUL, OP_EQ, OP_NE}
+
+# operand kinds used during compilation
+DEF ARGUMENT = 0
+DEF CONSTANT = 1
+DEF INSTRUCTION = 2
+
+
+cdef class CompiledFunction3D(Function3D):
+    """
+    A flattened and simplified equivalent of a Function3D expression.
+
+    Arithmetic, comparison and cmath operations on Function3D objects build a
+    tree of function objects. Evaluating the tree costs a virtual call per node,
+    and constants are held in separate nodes. This class compiles the tree into
+    a flat program that is executed by a single evaluate() call:
+
+    * nodes that are shared, or that are structurally identical, are evaluated once
+    * operations on constants are evaluated during compilation
+    * identity operations such as f() + 0, f() * 1 and f() ** 1 are removed
+    * f() ** 2 is replaced with f() * f()
+
+    Functions that are not built from the supported operators, such as
+    interpolators or wrapped python callables, are called unmodified. These
+    functions are assumed to return the same value when called with the same
+    arguments, as repeated calls are merged.
+
+    The compiled function holds a reference to the original function, it is not
+    updated if the original function is modified.
+
+    :param object function: A Function3D object or Python callable.
+
+    .. code-block:: pycon
+
+        >>> from raysect.core.math.function.float import Arg3D, Exp3D, compile_function3d
+        >>>
+        >>> x = Arg3D('x')
+        >>> y = Arg3D('y')
+        >>> f = 2 * Exp3D(-(x**2 + y**2)) + 3 * Exp3D(-(x**2 + y**2))
+        >>> fc = compile_function3d(f)
+        >>> fc(0.5, 0.5, 0)
+        3.032653298563167
+    """
+
+    def __init__(self, object function):
+
+        cdef int index, operand
+
+        self.function = autowrap_function3d(function)
+        self._active = False
+
+        program = _Compiler()
+        result = program.compile(self.function)
+
+        # register layout: the three arguments, the constants then the results of each instruction
+        self._count = len(program.instructions)
+        self._first = 3 + len(program.constants)
+
+        self._opcodes = np.empty(self._count, dtype=np.int32)
+        self._operand1 = np.empty(self._count, dtype=np.int32)
+        self._operand2 = np.empty(self._count, dtype=np.int32)
+        for index, (opcode, operand1, operand2) in enumerate(program.instructions):
+            self._opcodes[index] = opcode
+            if opcode == OP_CALL:
+                self._operand1[index] = operand1
+                self._operand2[index] = 0
+            else:
+                self._operand1[index] = self._register(operand1)
+                self._operand2[index] = self._register(operand2)
+
+        self._registers = np.zeros(self._first + self._count, dtype=np.float64)
+        for index, value in enumerate(program.constants):
+            self._registers[3 + index] = value
+
+        self._functions = tuple(program.functions)
+        self._result = self._register(result)
+
+    def __reduce__(self):
+        # the program is rebuilt from the original function when unpickled
+        return CompiledFunction3D, (self.function, )
+
+    cdef int _register(self, tuple operand):
+        kind, index = operand
+        if kind == ARGUMENT:
+            return index
+        if kind == CONSTANT:
+            return 3 + index
+        return self._first + index
+
+    @property
+    def instruction_count(self):
+        """
+        The number of instructions executed per evaluation.
+
+        :rtype: int
+        """
+        return self._count
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    @cython.initializedcheck(False)
+    cdef double evaluate(self, double x, double y, double z) except? -1e999:
+
+        # a function called by the program may re-enter this function, in which case
+        # the register file is duplicated to avoid overwriting the active registers
+        if self._active:
+            return self._execute(x, y, z, self._registers.copy())
+
+        self._active = True
+        try:
+            return self._execute(x, y, z, self._registers)
+        finally:
+            self._active = False
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    @cython.initializedcheck(False)
+    cdef double _execute(self, double x, double y, double z, double[::1] registers) except? -1e999:
+
+        cdef:
+            int i, opcode
+            double value
+
+        registers[0] = x
+        registers[1] = y
+        registers[2] = z
+
+        for i in range(self._count):
+            opcode = self._opcodes[i]
+            if opcode == OP_CALL:
+                value = (<Function3D> self._functions[self._operand1[i]]).evaluate(x, y, z)
+            else:
+                value = _apply(opcode, registers[self._operand1[i]], registers[self._operand2[i]])
+            registers[self._first + i] = value
+
+        return registers[self._result]
+
+
+cpdef CompiledFunction3D compile_function3d(object function):
+    """
+    Compiles a Function3D expression into an equivalent, faster CompiledFunction3D.
+
+    See CompiledFunction3D for details of the optimisations performed.
+
+    :param object function: A Function3D object or Python callable.
+    :return: The compiled function.
+    :rtype: CompiledFunction3D
+    """
+
+    return CompiledFunction3D(function)
+
+
+class _Compiler:
+    """
+    Translates a tree of Function3D objects into a list of instructions.
+
+    Operands are tuples of (kind, index) referring to an argument, a constant
+    or the result of an earlier instruction. Instructions are tuples of
+    (opcode, operand1, operand2), unary operations repeat their operand. The
+    operand of a call instruction is the index of the function to call.
+    """
+
+    def __init__(self):
+
+        self.constants = []
+        self.instructions = []
+        self.functions = []
+
+        self._constant_index = {}
+        self._instruction_index = {}
+        self._function_index = {}
+
+        # nodes are identified by object id, the nodes are held to keep the ids valid
+        self._node_operands = {}
+        self._nodes = []
+
+    def compile(self, Function3D function):
+
+        # the tree is traversed iteratively as deep expressions would exceed the recursion limit
+        stack = [(function, False)]
+        while stack:
+
+            node, expanded = stack.pop()
+            if id(node) in self._node_operands:
+                continue
+
+            kind, arguments = _decompose(node)
+
+            if not expanded:
+                stack.append((node, True))
+                for argument in arguments:
+                    if isinstance(argument, Function3D) and id(argument) not in self._node_operands:
+                        stack.append((argument, False))
+                continue
+
+            self._node_operands[id(node)] = self._translate(node, kind, arguments)
+            self._nodes.append(node)
+
+        return self._node_operands[id(function)]
+
+    def _translate(self, Function3D node, kind, arguments):
+
+        if kind == 'argument':
+            return ARGUMENT, arguments[0]
+
+        if kind == 'constant':
+            return self._constant(arguments[0])
+
+        if kind == 'alias':
+            return self._node_operands[id(arguments[0])]
+
+        if kind == 'call':
+            return self._call(node)
+
+        operands = [self._operand(argument) for argument in arguments]
+        if len(operands) == 1:
+            return self._unary(kind, operands[0])
+        return self._binary(kind, operands[0], operands[1])
+
+    def _operand(self, argument):
+        if isinstance(argument, Function3D):
+            return self._node_operands[id(argument)]
+        return self._constant(argument)
+
+    def _constant(self, double value):
+
+        # constants are identified by their bit pattern to distinguish -0.0 and to match nan
+        key = struct.pack('d', value)
+        index = self._constant_index.get(key)
+        if index is None:
+            index = self._constant_index[key] = len(self.constants)
+            self.constants.append(value)
+        return CONSTANT, index
+
+    def _value(self, operand):
+        kind, index = operand
+        if kind == CONSTANT:
+            return self.constants[index]
+        return None
+
+    def _call(self, Function3D function):
+
+        index = self._function_index.get(id(function))
+        if index is None:
+            index = self._function_index[id(function)] = len(self.functions)
+            self.functions.append(function)
+        return self._instruction(OP_CALL, index, index)
+
+    def _unary(self, int opcode, operand):
+
+        value = self._value(operand)
+        if value is not None:
+            try:
+                return self._constant(_apply(opcode, value, value))
+            except (ValueError, ZeroDivisionError):
+                # the error must be raised when the function is evaluated
+                pass
+
+        return self._instruction(opcode, operand, operand)
+
+    def _binary(self, int opcode, operand1, operand2):
+
+        value1 = self._value(operand1)
+        value2 = self._value(operand2)
+
+        # constant folding
+        if value1 is not None and value2 is not None:
+            try:
+                return self._constant(_apply(opcode, value1, value2))
+            except (ValueError, ZeroDivisionError):
+                # the error must be raised when the function is evaluated
+                pass
+
+        # identity operations
+        if opcode == OP_ADD:
+            if value1 == 0:
+                return operand2
+            if value2 == 0:
+                return operand1
+
+        elif opcode == OP_SUB:
+            if value2 == 0:
+                return operand1
+
+        elif opcode == OP_MUL:
+            if value1 == 1:
+                return operand2
+            if value2 == 1:
+                return operand1
+
+        elif opcode == OP_DIV:
+            if value2 == 1:
+                return operand1
+
+        elif opcode == OP_POW:
+            if value2 == 1:
+                return operand1
+            if value2 == 2:
+                return self._binary(OP_MUL, operand1, operand1)
+
+        # order the operands of commutative operations so equivalent expressions are merged
+        if opcode in _COMMUTATIVE and operand2 < operand1:
+            operand1, operand2 = operand2, operand1
+
+        return self._instruction(opcode, operand1, operand2)
+
+    def _instruction(self, int opcode, operand1, operand2):
+
+        key = (opcode, operand1, operand2)
+        index = self._instruction_index.get(key)
+        if index is None:
+            index = self._instruction_index[key] = len(self.instructions)
+            self.instructions.append(key)
+        return INSTRUCTION, index
+
+
+cdef tuple _decompose(Function3D node):
+    """
+    Identifies the operation performed by a function object.
+
+    :return: A tuple containing the kind of node and a list of its arguments,
+      the arguments are either Function3D objects or float constants.
+    """
+
+    cdef ArgLabel argument
+
+    if isinstance(node, Constant3D):
+        return 'constant', [(<Constant3D> node)._value]
+
+    if isinstance(node, Arg3D):
+        argument = (<Arg3D> node)._argument
+        return 'argument', [0 if argument == X else 1 if argument == Y else 2]
+
+    if isinstance(node, CompiledFunction3D):
+        return 'alias', [(<CompiledFunction3D> node).function]
+
+    # function-function operations
+    if isinstance(node, AddFunction3D):
+        return OP_ADD, [(<AddFunction3D> node)._function1, (<AddFunction3D> node)._function2]
+    if isinstance(node, SubtractFunction3D):
+        return OP_SUB, [(<SubtractFunction3D> node)._function1, (<SubtractFunction3D> node)._function2]
+    if isinstance(node, MultiplyFunction3D):
+        return OP_MUL, [(<MultiplyFunction3D> node)._function1, (<MultiplyFunction3D> node)._function2]
+    if isinstance(node, DivideFunction3D):
+        return OP_DIV, [(<DivideFunction3D> node)._function1, (<DivideFunction3D> node)._function2]
+    if isinstance(node, ModuloFunction3D):
+        return OP_MOD, [(<ModuloFunction3D> node)._function1, (<ModuloFunction3D> node)._function2]
+    if isinstance(node, PowFunction3D):
+        return OP_POW, [(<PowFunction3D> node)._function1, (<PowFunction3D> node)._function2]
+    if isinstance(node, EqualsFunction3D):
+        return OP_EQ, [(<EqualsFunction3D> node)._function1, (<EqualsFunction3D> node)._function2]
+    if isinstance(node, NotEqualsFunction3D):
+        return OP_NE, [(<NotEqualsFunction3D> node)._function1, (<NotEqualsFunction3D> node)._function2]
+    if isinstance(node, LessThanFunction3D):
+        return OP_LT, [(<LessThanFunction3D> node)._function1, (<LessThanFunction3D> node)._function2]
+    if isinstance(node, GreaterThanFunction3D):
+        return OP_GT, [(<GreaterThanFunction3D> node)._function1, (<GreaterThanFunction3D> node)._function2]
+    if isinstance(node, LessEqualsFunction3D):
+        return OP_LE, [(<LessEqualsFunction3D> node)._function1, (<LessEqualsFunction3D> node)._function2]
+    if isinstance(node, GreaterEqualsFunction3D):
+        return OP_GE, [(<GreaterEqualsFunction3D> node)._function1, (<GreaterEqualsFunction3D> node)._function2]
+    if isinstance(node, AbsFunction3D):
+        return OP_ABS, [(<AbsFunction3D> node)._function]
+
+    # scalar-function operations
+    if isinstance(node, AddScalar3D):
+        return OP_ADD, [(<AddScalar3D> node)._value, (<AddScalar3D> node)._function]
+    if isinstance(node, SubtractScalar3D):
+        return OP_SUB, [(<SubtractScalar3D> node)._value, (<SubtractScalar3D> node)._function]
+    if isinstance(node, MultiplyScalar3D):
+        return OP_MUL, [(<MultiplyScalar3D> node)._value, (<MultiplyScalar3D> node)._function]
+    if isinstance(node, DivideScalar3D):
+        return OP_DIV, [(<DivideScalar3D> node)._value, (<DivideScalar3D> node)._function]
+    if isinstance(node, ModuloScalarFunction3D):
+        return OP_MOD, [(<ModuloScalarFunction3D> node)._value, (<ModuloScalarFunction3D> node)._function]
+    if isinstance(node, ModuloFunctionScalar3D):
+        return OP_MOD, [(<ModuloFunctionScalar3D> node)._function, (<ModuloFunctionScalar3D> node)._value]
+    if isinstance(node, PowScalarFunction3D):
+        return OP_POW, [(<PowScalarFunction3D> node)._value, (<PowScalarFunction3D> node)._function]
+    if isinstance(node, PowFunctionScalar3D):
+        return OP_POW, [(<PowFunctionScalar3D> node)._function, (<PowFunctionScalar3D> node)._value]
+    if isinstance(node, EqualsScalar3D):
+        return OP_EQ, [(<EqualsScalar3D> node)._value, (<EqualsScalar3D> node)._function]
+    if isinstance(node, NotEqualsScalar3D):
+        return OP_NE, [(<NotEqualsScalar3D> node)._value, (<NotEqualsScalar3D> node)._function]
+    if isinstance(node, LessThanScalar3D):
+        return OP_LT, [(<LessThanScalar3D> node)._value, (<LessThanScalar3D> node)._function]
+    if isinstance(node, GreaterThanScalar3D):
+        return OP_GT, [(<GreaterThanScalar3D> node)._value, (<GreaterThanScalar3D> node)._function]
+    if isinstance(node, LessEqualsScalar3D):
+        return OP_LE, [(<LessEqualsScalar3D> node)._value, (<LessEqualsScalar3D> node)._function]
+    if isinstance(node, GreaterEqualsScalar3D):
+        return OP_GE, [(<GreaterEqualsScalar3D> node)._value, (<GreaterEqualsScalar3D> node)._function]
+
+    # cmath functions
+    if isinstance(node, Exp3D):
+        return OP_EXP, [(<Exp3D> node)._function]
+    if isinstance(node, Sin3D):
+        return OP_SIN, [(<Sin3D> node)._function]
+    if isinstance(node, Cos3D):
+        return OP_COS, [(<Cos3D> node)._function]
+    if isinstance(node, Tan3D):
+        return OP_TAN, [(<Tan3D> node)._function]
+    if isinstance(node, Asin3D):
+        return OP_ASIN, [(<Asin3D> node)._function]
+    if isinstance(node, Acos3D):
+        return OP_ACOS, [(<Acos3D> node)._function]
+    if isinstance(node, Atan3D):
+        return OP_ATAN, [(<Atan3D> node)._function]
+    if isinstance(node, Atan4Q3D):
+        return OP_ATAN2, [(<Atan4Q3D> node)._numerator, (<Atan4Q3D> node)._denominator]
+    if isinstance(node, Sqrt3D):
+        return OP_SQRT, [(<Sqrt3D> node)._function]
+    if isinstance(node, Erf3D):
+        return OP_ERF, [(<Erf3D> node)._function]
+
+    # any other function is called directly
+    return 'call', []
+
+
+@cython.cdivision(True)
+cdef double _apply(int opcode, double a, double b) except? -1e999:
+    """
+    Performs an operation on one or two operands.
+
+    The results and errors match those of the equivalent Function3D classes.
+
+    :param opcode: The operation to perform.
+    :param a: The first operand.
+    :param b: The second operand, ignored for unary operations.
+    :return: The result of the operation.
+    """
+
+    if opcode == OP_ADD:
+        return a + b
+
+    elif opcode == OP_SUB:
+        return a - b
+
+    elif opcode == OP_MUL:
+        return a * b
+
+    elif opcode == OP_DIV:
+        if b == 0.0:
+            raise ZeroDivisionError("Function used as the denominator of the division returned a zero value.")
+        return a / b
+
+    elif opcode == OP_MOD:
+        if b == 0.0:
+            raise ZeroDivisionError("Function used as the divisor of the modulo returned a zero value.")
+        return a % b
+
+    elif opcode == OP_POW:
+        if a < 0 and floor(b) != b:  # would return a complex value rather than double
+            raise ValueError("Negative base and non-integral exponent is not supported")
+        if a == 0 and b < 0:
+            raise ZeroDivisionError("0.0 cannot be raised to a negative power")
+        return a ** b
+
+    elif opcode == OP_ABS:
+        return abs(a)
+
+    elif opcode == OP_EQ:
+        return a == b
+
+    elif opcode == OP_NE:
+        return a != b
+
+    elif opcode == OP_LT:
+        return a < b
+
+    elif opcode == OP_GT:
+        return a > b
+
+    elif opcode == OP_LE:
+        return a <= b
+
+    elif opcode == OP_GE:
+        return a >= b
+
+    elif opcode == OP_EXP:
+        return cmath.exp(a)
+
+    elif opcode == OP_SIN:
+        return cmath.sin(a)
+
+    elif opcode == OP_COS:
+        return cmath.cos(a)
+
+    elif opcode == OP_TAN:
+        return cmath.tan(a)
+
+    elif opcode == OP_ASIN:
+        if -1.0 <= a <= 1.0:
+            return cmath.asin(a)
+        raise ValueError("The function returned a value outside of the arcsine domain of [-1, 1].")
+
+    elif opcode == OP_ACOS:
+        if -1.0 <= a <= 1.0:
+            return cmath.acos(a)
+        raise ValueError("The function returned a value outside of the arccosine domain of [-1, 1].")
+
+    elif opcode == OP_ATAN:
+        return cmath.atan(a)
+
+    elif opcode == OP_ATAN2:
+        return cmath.atan2(a, b)
+
+    elif opcode == OP_SQRT:
+        if a < 0:  # complex values are not supported
+            raise ValueError("Math domain error in sqrt({0}). Sqrt of a negative value is not supported.".format(a))
+        return cmath.sqrt(a)
+
+    elif opcode == OP_ERF:
+        return cmath.erf(a)
+
+    raise ValueError("Unknown opcode.")
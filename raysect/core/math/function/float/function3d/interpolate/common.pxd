@@ -0,0 +1,57 @@
+# cython: language_level=3
+
+# Copyright (c) 2014-2020, Dr Alex Meakins, Raysect Project
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#     1. Redistributions of source code must retain the above copyright notice,
+#        this list of conditions and the following disclaimer.
+#
+#     2. Redistributions in binary form must reproduce the above copyright
+#        notice, this list of conditions and the following disclaimer in the
+#        documentation and/or other materials provided with the distribution.
+#
+#     3. Neither the name of the Raysect Project nor the names of its
+#        contributors may be used to endorse or promote products derived from
+#        this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+cimport numpy as np
+from raysect.core.boundingbox cimport BoundingBox3D
+from raysect.core.math.spatial.kdtree3d cimport KDTree3DCore
+
+
+cdef class MeshKDTree3D(KDTree3DCore):
+
+    cdef:
+        np.ndarray _vertices
+        np.ndarray _tetrahedra
+        np.ndarray _neighbours
+        double[:, ::1] _vertices_mv
+        np.int32_t[:, ::1] _tetrahedra_mv
+        np.int32_t[:, ::1] _neighbours_mv
+        np.int32_t tetrahedra_id
+        np.int32_t i1, i2, i3, i4
+        double alpha, beta, gamma, delta
+        np.int32_t _last_tetrahedra
+
+    cdef void _reset_hit_state(self)
+
+    cdef BoundingBox3D _generate_bounding_box(self, np.int32_t tetrahedra)
+
+    cdef bint _test_tetrahedra(self, np.int32_t tetrahedra, double x, double y, double z)
+
+    cdef bint _locate(self, double x, double y, double z)
@@ -0,0 +1,330 @@
+# cython: language_level=3
+
+# Copyright (c) 2014-2020, Dr Alex Meakins, Raysect Project
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#     1. Redistributions of source code must retain the above copyright notice,
+#        this list of conditions and the following disclaimer.
+#
+#     2. Redistributions in binary form must reproduce the above copyright
+#        notice, this list of conditions and the following disclaimer in the
+#        documentation and/or other materials provided with the distribution.
+#
+#     3. Neither the name of the Raysect Project nor the names of its
+#        contributors may be used to endorse or promote products derived from
+#        this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+import numpy as np
+cimport numpy as np
+from raysect.core.math.spatial.kdtree3d cimport Item3D
+from raysect.core.boundingbox cimport BoundingBox3D, new_boundingbox3d
+from raysect.core.math.point cimport Point3D, new_point3d
+from raysect.core.math.cython cimport barycentric_coords_tetra, barycentric_inside_tetrahedra
+cimport cython
+
+# bounding box is padded by a small amount to avoid numerical accuracy issues
+DEF BOX_PADDING = 1e-6
+
+# convenience defines
+DEF V1 = 0
+DEF V2 = 1
+DEF V3 = 2
+DEF V4 = 3
+
+DEF X = 0
+DEF Y = 1
+DEF Z = 2
+
+# no cached tetrahedra / no neighbouring tetrahedra
+DEF NO_TETRAHEDRA = -1
+
+
+cdef class MeshKDTree3D(KDTree3DCore):
+    """
+    A kd-tree for locating the tetrahedron of a mesh enclosing a point.
+
+    In addition to the kd-tree, the face adjacency of the tetrahedra is
+    computed at construction. The last tetrahedron found to contain a point
+    is remembered and, together with its face neighbours, is tested before
+    the tree is traversed. Consecutive look-ups along a line of sight
+    typically fall in the same or an adjacent tetrahedron, so most queries
+    are resolved without a tree traversal.
+
+    :param ndarray vertices: An array of vertex coordinates (x, y, z) with shape Nx3.
+    :param ndarray tetrahedra: An array of vertex indices defining the mesh tetrahedra, with shape Mx4.
+    """
+
+    def __init__(self, object vertices not None, object tetrahedra not None):
+
+        vertices = np.array(vertices, dtype=np.double)
+        tetrahedra = np.array(tetrahedra, dtype=np.int32)
+
+        # check dimensions are correct
+        if vertices.ndim != 2 or vertices.shape[1] != 3:
+            raise ValueError("The vertex array must have dimensions Nx3.")
+
+        if tetrahedra.ndim != 2 or tetrahedra.shape[1] != 4:
+            raise ValueError("The tetrahedra array must have dimensions Mx4.")
+
+        # check tetrahedra contains only valid indices
+        invalid = (tetrahedra[:, 0:4] < 0) | (tetrahedra[:, 0:4] >= vertices.shape[0])
+        if invalid.any():
+            raise ValueError("The tetrahedra array references non-existent vertices.")
+
+        # assign to internal attributes
+        self._vertices = vertices
+        self._tetrahedra = tetrahedra
+        self._neighbours = _face_neighbours(tetrahedra)
+
+        # assign to memory views
+        self._vertices_mv = vertices
+        self._tetrahedra_mv = tetrahedra
+        self._neighbours_mv = self._neighbours
+
+        # initialise hit state attributes
+        self._reset_hit_state()
+
+        # kd-Tree init
+        items = []
+        for index in range(self._tetrahedra.shape[0]):
+            items.append(Item3D(index, self._generate_bounding_box(index)))
+        super().__init__(items, max_depth=0, min_items=1, hit_cost=50.0, empty_bonus=0.2)
+
+    def __getstate__(self):
+        return self._tetrahedra, self._vertices, self._neighbours, super().__getstate__()
+
+    def __setstate__(self, state):
+
+        self._tetrahedra, self._vertices, self._neighbours, super_state = state
+        super().__setstate__(super_state)
+
+        # rebuild memory views
+        self._vertices_mv = self._vertices
+        self._tetrahedra_mv = self._tetrahedra
+        self._neighbours_mv = self._neighbours
+
+        # initialise hit state attributes
+        self._reset_hit_state()
+
+    def __reduce__(self):
+        return self.__new__, (self.__class__, ), self.__getstate__()
+
+    cdef void _reset_hit_state(self):
+
+        self.tetrahedra_id = NO_TETRAHEDRA
+        self.i1 = -1
+        self.i2 = -1
+        self.i3 = -1
+        self.i4 = -1
+        self.alpha = 0.0
+        self.beta = 0.0
+        self.gamma = 0.0
+        self.delta = 0.0
+        self._last_tetrahedra = NO_TETRAHEDRA
+
+    @property
+    def neighbours(self):
+        """
+        The face adjacency of the mesh tetrahedra as an Mx4 array.
+
+        Element [i, j] is the index of the tetrahedron sharing the face of
+        tetrahedron i opposite its j-th vertex, or -1 if the face lies on the
+        mesh boundary.
+        """
+        return self._neighbours.copy()
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    @cython.initializedcheck(False)
+    cdef BoundingBox3D _generate_bounding_box(self, np.int32_t tetrahedra):
+        """
+        Generates a bounding box for the specified tetrahedron.
+
+        A small degree of padding is added to the bounding box to provide
+        conservative bounds and avoid numerical representation issues.
+
+        :param tetrahedra: Tetrahedra array index.
+        :return: A BoundingBox3D object.
+        """
+
+        cdef:
+            np.int32_t i1, i2, i3, i4
+            BoundingBox3D bbox
+
+        i1 = self._tetrahedra_mv[tetrahedra, V1]
+        i2 = self._tetrahedra_mv[tetrahedra, V2]
+        i3 = self._tetrahedra_mv[tetrahedra, V3]
+        i4 = self._tetrahedra_mv[tetrahedra, V4]
+
+        bbox = new_boundingbox3d(
+            new_point3d(
+                min(self._vertices_mv[i1, X], self._vertices_mv[i2, X], self._vertices_mv[i3, X], self._vertices_mv[i4, X]),
+                min(self._vertices_mv[i1, Y], self._vertices_mv[i2, Y], self._vertices_mv[i3, Y], self._vertices_mv[i4, Y]),
+                min(self._vertices_mv[i1, Z], self._vertices_mv[i2, Z], self._vertices_mv[i3, Z], self._vertices_mv[i4, Z]),
+            ),
+            new_point3d(
+                max(self._vertices_mv[i1, X], self._vertices_mv[i2, X], self._vertices_mv[i3, X], self._vertices_mv[i4, X]),
+                max(self._vertices_mv[i1, Y], self._vertices_mv[i2, Y], self._vertices_mv[i3, Y], self._vertices_mv[i4, Y]),
+                max(self._vertices_mv[i1, Z], self._vertices_mv[i2, Z], self._vertices_mv[i3, Z], self._vertices_mv[i4, Z]),
+            ),
+        )
+
+        bbox.pad(max(BOX_PADDING, bbox.largest_extent() * BOX_PADDING))
+
+        return bbox
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    @cython.initializedcheck(False)
+    cdef bint _test_tetrahedra(self, np.int32_t tetrahedra, double x, double y, double z):
+        """
+        Tests if a tetrahedron contains the point, recording the hit state if it does.
+
+        :param tetrahedra: Tetrahedra array index.
+        :param x: x coordinate of the point.
+        :param y: y coordinate of the point.
+        :param z: z coordinate of the point.
+        :return: True if the tetrahedron contains the point, False otherwise.
+        """
+
+        cdef:
+            np.int32_t i1, i2, i3, i4
+            double alpha, beta, gamma, delta
+
+        # obtain vertex indices
+        i1 = self._tetrahedra_mv[tetrahedra, V1]
+        i2 = self._tetrahedra_mv[tetrahedra, V2]
+        i3 = self._tetrahedra_mv[tetrahedra, V3]
+        i4 = self._tetrahedra_mv[tetrahedra, V4]
+
+        barycentric_coords_tetra(self._vertices_mv[i1, X], self._vertices_mv[i1, Y], self._vertices_mv[i1, Z],
+                                 self._vertices_mv[i2, X], self._vertices_mv[i2, Y], self._vertices_mv[i2, Z],
+                                 self._vertices_mv[i3, X], self._vertices_mv[i3, Y], self._vertices_mv[i3, Z],
+                                 self._vertices_mv[i4, X], self._vertices_mv[i4, Y], self._vertices_mv[i4, Z],
+                                 x, y, z, &alpha, &beta, &gamma, &delta)
+
+        if not barycentric_inside_tetrahedra(alpha, beta, gamma, delta):
+            return False
+
+        # store id of tetrahedra hit
+        self.tetrahedra_id = tetrahedra
+        self._last_tetrahedra = tetrahedra
+
+        # store vertex indices and barycentric coords
+        self.i1 = i1
+        self.i2 = i2
+        self.i3 = i3
+        self.i4 = i4
+        self.alpha = alpha
+        self.beta = beta
+        self.gamma = gamma
+        self.delta = delta
+
+        return True
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    @cython.initializedcheck(False)
+    cdef bint _locate(self, double x, double y, double z):
+        """
+        Identifies the tetrahedron containing the point.
+
+        The last tetrahedron hit and its face neighbours are tested before
+        falling back to a full traversal of the kd-tree.
+
+        :param x: x coordinate of the point.
+        :param y: y coordinate of the point.
+        :param z: z coordinate of the point.
+        :return: True if the point lies inside the mesh, False otherwise.
+        """
+
+        cdef:
+            np.int32_t last, neighbour, face
+
+        last = self._last_tetrahedra
+        if last != NO_TETRAHEDRA:
+
+            if self._test_tetrahedra(last, x, y, z):
+                return True
+
+            for face in range(4):
+                neighbour = self._neighbours_mv[last, face]
+                if neighbour != NO_TETRAHEDRA and self._test_tetrahedra(neighbour, x, y, z):
+                    return True
+
+        return self._is_contained(new_point3d(x, y, z))
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    @cython.initializedcheck(False)
+    cdef bint _is_contained_leaf(self, np.int32_t id, Point3D point):
+
+        cdef np.int32_t index
+
+        # identify the first tetrahedra that contains the point, if any
+        for index in range(self._nodes[id].count):
+            if self._test_tetrahedra(self._nodes[id].items[index], point.x, point.y, point.z):
+                return True
+
+        return False
+
+    cpdef bint is_contained(self, Point3D point):
+        """
+        Identifies if the point is contained by a tetrahedron of the mesh.
+
+        :param Point3D point: A Point3D object.
+        :return: True if the point lies inside the mesh, false otherwise.
+        """
+
+        return self._locate(point.x, point.y, point.z)
+
+
+def _face_neighbours(np.ndarray tetrahedra):
+    """
+    Computes the face adjacency of a set of tetrahedra.
+
+    The faces of every tetrahedron are sorted so that a face shared by two
+    tetrahedra has an identical key. Sorting the keys brings the shared faces
+    together, which are then linked in a single vectorised pass.
+
+    :param tetrahedra: An array of vertex indices with shape Mx4.
+    :return: An Mx4 int32 array of neighbour indices, -1 for boundary faces.
+    """
+
+    cdef:
+        np.npy_intp count = tetrahedra.shape[0]
+
+    neighbours = np.full((count, 4), NO_TETRAHEDRA, dtype=np.int32)
+    if count == 0:
+        return neighbours
+
+    # face j of a tetrahedron is the face opposite vertex j
+    faces = np.concatenate([np.sort(np.delete(tetrahedra, j, axis=1), axis=1) for j in range(4)])
+    owners = np.tile(np.arange(count, dtype=np.int32), 4)
+    slots = np.repeat(np.arange(4, dtype=np.int32), count)
+
+    order = np.lexsort((faces[:, 2], faces[:, 1], faces[:, 0]))
+    faces = faces[order]
+    shared = np.nonzero(np.all(faces[1:] == faces[:-1], axis=1))[0]
+
+    a = order[shared]
+    b = order[shared + 1]
+    neighbours[owners[a], slots[a]] = owners[b]
+    neighbours[owners[b], slots[b]] = owners[a]
+
+    return neighbours
@@ -0,0 +1,2 @@
+from .test_interpolator3darray import *
+from .test_interpolator3dmesh import *
@@ -0,0 +1,114 @@
+# Copyright (c) 2014-2020, Dr Alex Meakins, Raysect Project
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#     1. Redistributions of source code must retain the above copyright notice,
+#        this list of conditions and the following disclaimer.
+#
+#     2. Redistributions in binary form must reproduce the above copyright
+#        notice, this list of conditions and the following disclaimer in the
+#        documentation and/or other materials provided with the distribution.
+#
+#     3. Neither the name of the Raysect Project nor the names of its
+#        contributors may be used to endorse or promote products derived from
+#        this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Unit tests for the Interpolator3DArray class.
+"""
+
+import pickle
+import unittest
+import numpy as np
+from raysect.core.math.function.float.function3d.interpolate import Interpolator3DArray
+
+
+class TestInterpolator3DArray(unittest.TestCase):
+
+    def setUp(self):
+
+        self.x = np.array([-1.0, -0.6, 0.1, 0.5, 1.2])
+        self.y = np.linspace(0, 3, 6)
+        self.z = np.array([0.0, 0.2, 0.9, 1.0])
+        self.points = [
+            (x, y, z)
+            for x in np.linspace(-1, 1.2, 7)
+            for y in np.linspace(0, 3, 5)
+            for z in np.linspace(0, 1, 6)
+        ]
+
+    def grid(self, function):
+        return function(self.x[:, None, None], self.y[None, :, None], self.z[None, None, :])
+
+    def test_trilinear(self):
+
+        # trilinear functions are reproduced exactly by both interpolation types
+        function = lambda x, y, z: 1 + 2 * x - 3 * y + z + 0.5 * x * y - y * z + 0.25 * x * y * z
+        for interpolation in ('linear', 'cubic'):
+            interpolator = Interpolator3DArray(self.x, self.y, self.z, self.grid(function), interpolation)
+            for x, y, z in self.points:
+                self.assertAlmostEqual(interpolator(x, y, z), function(x, y, z), places=12,
+                                       msg="Interpolation did not reproduce a trilinear function.")
+
+    def test_cubic(self):
+
+        # quadratic functions are reproduced away from the grid edges of a uniform grid
+        x = np.linspace(-1, 1, 7)
+        y = np.linspace(0, 2, 7)
+        z = np.linspace(-3, 0, 7)
+        function = lambda x, y, z: x**2 - 2 * x * y + 0.5 * z**2 + y * z
+        interpolator = Interpolator3DArray(x, y, z, function(x[:, None, None], y[None, :, None], z[None, None, :]), 'cubic')
+        for vx in np.linspace(x[1], x[-2], 5):
+            for vy in np.linspace(y[1], y[-2], 5):
+                for vz in np.linspace(z[1], z[-2], 5):
+                    self.assertAlmostEqual(interpolator(vx, vy, vz), function(vx, vy, vz), places=12,
+                                           msg="Cubic interpolation did not reproduce a quadratic function.")
+
+    def test_extrapolation(self):
+
+        function = lambda x, y, z: 1 + 2 * x - 3 * y + z
+        f = self.grid(function)
+
+        interpolator = Interpolator3DArray(self.x, self.y, self.z, f)
+        with self.assertRaises(ValueError):
+            interpolator(0, 0, 1.5)
+
+        interpolator = Interpolator3DArray(self.x, self.y, self.z, f, 'cubic', 'nearest')
+        self.assertAlmostEqual(interpolator(-2, 1.5, 2), function(-1, 1.5, 1), places=12)
+
+        interpolator = Interpolator3DArray(self.x, self.y, self.z, f, 'linear', 'linear', 1.0)
+        self.assertAlmostEqual(interpolator(-1.5, 3.5, 1.5), function(-1.5, 3.5, 1.5), places=12)
+        with self.assertRaises(ValueError):
+            interpolator(0, 0, 2.5)
+
+    def test_invalid(self):
+
+        with self.assertRaises(ValueError):
+            Interpolator3DArray(self.x, self.y, self.z, np.zeros((5, 6, 3)))
+
+        with self.assertRaises(ValueError):
+            Interpolator3DArray(self.x, self.y, [0, 0, 1, 2], np.zeros((5, 6, 4)))
+
+    def test_pickle(self):
+        interpolator = Interpolator3DArray(self.x, self.y, self.z, self.grid(lambda x, y, z: np.cos(x + y) * z), 'cubic', 'linear', 0.5)
+        restored = pickle.loads(pickle.dumps(interpolator))
+        for x, y, z in self.points:
+            self.assertEqual(restored(x, y, z), interpolator(x, y, z))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,222 @@
+# Copyright (c) 2014-2020, Dr Alex Meakins, Raysect Project
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#     1. Redistributions of source code must retain the above copyright notice,
+#        this list of conditions and the following disclaimer.
+#
+#     2. Redistributions in binary form must reproduce the above copyright
+#        notice, this list of conditions and the following disclaimer in the
+#        documentation and/or other materials provided with the distribution.
+#
+#     3. Neither the name of the Raysect Project nor the names of its
+#        contributors may be used to endorse or promote products derived from
+#        this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Unit tests for the Interpolator3DMesh and Discrete3DMesh classes.
+"""
+
+import pickle
+import unittest
+from itertools import permutations
+import numpy as np
+from raysect.core.math.function.float.function3d.interpolate import Interpolator3DMesh, Discrete3DMesh
+from raysect.core.math.function.float.function3d.interpolate.common import MeshKDTree3D
+from raysect.core.math import Point3D
+
+
+def _generate_mesh(n, origin=(-1.0, 0.0, 2.0), size=(2.0, 1.0, 3.0)):
+    """
+    Generates a conforming tetrahedral mesh of a box.
+
+    The box is divided into n^3 cells, each split into 6 tetrahedra that
+    share the cell diagonal (Kuhn triangulation).
+    """
+
+    axis = [np.linspace(o, o + s, n + 1) for o, s in zip(origin, size)]
+    x, y, z = np.meshgrid(*axis, indexing='ij')
+    vertices = np.stack((x.ravel(), y.ravel(), z.ravel()), axis=1)
+
+    def index(i, j, k):
+        return (i * (n + 1) + j) * (n + 1) + k
+
+    tetrahedra = []
+    for i in range(n):
+        for j in range(n):
+            for k in range(n):
+                for order in permutations(range(3)):
+                    corner = [i, j, k]
+                    tetrahedron = [index(*corner)]
+                    for axis_index in order:
+                        corner[axis_index] += 1
+                        tetrahedron.append(index(*corner))
+                    tetrahedra.append(tetrahedron)
+
+    return vertices, np.array(tetrahedra, dtype=np.int32)
+
+
+def _linear(x, y, z):
+    return 1.5 - 2.0 * x + 0.5 * y + 3.0 * z
+
+
+class TestInterpolator3DMesh(unittest.TestCase):
+
+    def setUp(self):
+
+        self.vertices, self.tetrahedra = _generate_mesh(4)
+        self.data = _linear(self.vertices[:, 0], self.vertices[:, 1], self.vertices[:, 2])
+
+        rng = np.random.RandomState(3)
+        self.points = rng.uniform((-1, 0, 2), (1, 1, 5), size=(500, 3))
+
+    def test_neighbours(self):
+
+        tree = MeshKDTree3D(self.vertices, self.tetrahedra)
+        neighbours = tree.neighbours
+
+        # 6 tetrahedra per cell, 2 boundary faces per tetrahedron on each of the 6 box sides
+        self.assertEqual(neighbours.shape, (self.tetrahedra.shape[0], 4))
+        self.assertEqual((neighbours == -1).sum(), 6 * 2 * 4 * 4)
+
+        for tetrahedron, faces in enumerate(neighbours):
+            for face, neighbour in enumerate(faces):
+                if neighbour == -1:
+                    continue
+
+                # adjacency must be symmetric and the shared face must be the face opposite the vertex
+                self.assertIn(tetrahedron, neighbours[neighbour])
+                shared = set(self.tetrahedra[tetrahedron]) - {self.tetrahedra[tetrahedron, face]}
+                self.assertTrue(shared.issubset(set(self.tetrahedra[neighbour])))
+
+    def test_interpolation(self):
+
+        # a linear function is reproduced exactly by barycentric interpolation
+        interpolator = Interpolator3DMesh(self.vertices, self.data, self.tetrahedra)
+        for x, y, z in self.points:
+            self.assertAlmostEqual(interpolator(x, y, z), _linear(x, y, z), places=10)
+
+        # vertices
+        for (x, y, z), v in zip(self.vertices, self.data):
+            self.assertAlmostEqual(interpolator(x, y, z), v, places=10)
+
+    def test_coherent_queries(self):
+
+        # evaluations along a line exercise the cached and neighbour searches, the result
+        # must match a fresh interpolator for which every query requires a tree search
+        interpolator = Interpolator3DMesh(self.vertices, self.data, self.tetrahedra)
+        start = np.array([-0.9, 0.1, 2.05])
+        end = np.array([0.95, 0.9, 4.9])
+        for t in np.linspace(0, 1, 100):
+            x, y, z = start + t * (end - start)
+            fresh = Interpolator3DMesh(self.vertices, self.data, self.tetrahedra)
+            self.assertAlmostEqual(interpolator(x, y, z), fresh(x, y, z), places=12)
+
+    def test_limits(self):
+
+        interpolator = Interpolator3DMesh(self.vertices, self.data, self.tetrahedra)
+        with self.assertRaises(ValueError):
+            interpolator(1.5, 0.5, 3.0)
+
+        # a point outside the mesh following a point inside must not return the cached tetrahedron
+        interpolator(0.99, 0.5, 3.0)
+        with self.assertRaises(ValueError):
+            interpolator(1.01, 0.5, 3.0)
+
+        interpolator = Interpolator3DMesh(self.vertices, self.data, self.tetrahedra, limit=False, default_value=-7.0)
+        self.assertEqual(interpolator(1.5, 0.5, 3.0), -7.0)
+
+    def test_instance(self):
+
+        interpolator = Interpolator3DMesh(self.vertices, self.data, self.tetrahedra)
+        other = Interpolator3DMesh.instance(interpolator, vertex_data=2 * self.data, limit=False, default_value=1.0)
+        for x, y, z in self.points[:50]:
+            self.assertAlmostEqual(other(x, y, z), 2 * _linear(x, y, z), places=10)
+        self.assertEqual(other(10, 10, 10), 1.0)
+
+        with self.assertRaises(ValueError):
+            Interpolator3DMesh.instance(interpolator, vertex_data=self.data[:-1])
+
+    def test_invalid(self):
+
+        with self.assertRaises(ValueError):
+            Interpolator3DMesh(self.vertices, self.data[:-1], self.tetrahedra)
+
+        with self.assertRaises(ValueError):
+            Interpolator3DMesh(self.vertices[:, :2], self.data, self.tetrahedra)
+
+        with self.assertRaises(ValueError):
+            Interpolator3DMesh(self.vertices, self.data, self.tetrahedra[:, :3])
+
+        with self.assertRaises(ValueError):
+            Interpolator3DMesh(self.vertices, self.data, self.tetrahedra + 1000)
+
+    def test_pickle(self):
+
+        interpolator = Interpolator3DMesh(self.vertices, self.data, self.tetrahedra)
+        restored = pickle.loads(pickle.dumps(interpolator))
+        for x, y, z in self.points[:50]:
+            self.assertEqual(restored(x, y, z), interpolator(x, y, z))
+
+
+class TestDiscrete3DMesh(unittest.TestCase):
+
+    def setUp(self):
+
+        self.vertices, self.tetrahedra = _generate_mesh(3)
+        self.data = np.arange(self.tetrahedra.shape[0], dtype=np.float64)
+
+        rng = np.random.RandomState(5)
+        self.points = rng.uniform((-1, 0, 2), (1, 1, 5), size=(300, 3))
+
+    def test_evaluate(self):
+
+        discrete = Discrete3DMesh(self.vertices, self.tetrahedra, self.data)
+        for point in self.points:
+
+            tetrahedron = self.tetrahedra[int(discrete(*point))]
+
+            # the returned tetrahedron must contain the point
+            v = self.vertices[tetrahedron]
+            coords = np.linalg.solve((v[:3] - v[3]).T, point - v[3])
+            self.assertTrue(np.all(coords >= -1e-12) and coords.sum() <= 1 + 1e-12)
+
+    def test_limits(self):
+
+        discrete = Discrete3DMesh(self.vertices, self.tetrahedra, self.data)
+        with self.assertRaises(ValueError):
+            discrete(0, 0, 0)
+
+        discrete = Discrete3DMesh.instance(discrete, limit=False, default_value=-1.0)
+        self.assertEqual(discrete(0, 0, 0), -1.0)
+
+    def test_pickle(self):
+
+        discrete = Discrete3DMesh(self.vertices, self.tetrahedra, self.data)
+        restored = pickle.loads(pickle.dumps(discrete))
+        for point in self.points[:50]:
+            self.assertEqual(restored(*point), discrete(*point))
+
+    def test_kdtree_is_contained(self):
+
+        tree = MeshKDTree3D(self.vertices, self.tetrahedra)
+        self.assertTrue(tree.is_contained(Point3D(0, 0.5, 3)))
+        self.assertFalse(tree.is_contained(Point3D(0, 1.5, 3)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -33,6 +33,7 @@ Unit tests for the Function3D class.
 
 import math
 import unittest
+import numpy as np
 from raysect.core.math.function.float.function3d.autowrap import PythonFunction3D
 
 # TODO: expand tests to cover the cython interface
@@ -53,6 +54,33 @@ class TestFunction3D(unittest.TestCase):
                 for z in v:
                     self.assertEqual(self.f1(x, y, z), self.ref1(x, y, z), "Function3D call did not match reference function value.")
 
+    def test_evaluate_array(self):
+        x = np.linspace(-5, 5, 6)
+        y = np.linspace(-2, 3, 5)
+        z = np.linspace(0, 1, 4)
+        r = 2 * self.f1 + self.f2 / 4
+
+        # coordinate arrays are broadcast
+        result = r.evaluate_array(x[:, None, None], y[None, :, None], z[None, None, :])
+        self.assertEqual(result.shape, (6, 5, 4))
+        for i, vx in enumerate(x):
+            for j, vy in enumerate(y):
+                for k, vz in enumerate(z):
+                    self.assertEqual(result[i, j, k], r(vx, vy, vz), "Function3D evaluate_array did not match the scalar call.")
+
+    def test_evaluate_array_out(self):
+        x = np.linspace(-5, 5, 6).reshape(2, 3)
+        out = np.empty((2, 3))
+        self.assertIs(self.f1.evaluate_array(x, x, x, out=out), out, "Function3D evaluate_array did not return the output array.")
+        np.testing.assert_array_equal(out, 17 * x)
+        with self.assertRaises(ValueError, msg="Function3D evaluate_array accepted an output array with an incorrect shape."):
+            self.f1.evaluate_array(x, x, x, out=np.empty(6))
+
+    def test_evaluate_array_exception(self):
+        r = self.f1 / self.f1
+        with self.assertRaises(ZeroDivisionError, msg="Function3D evaluate_array did not propagate an exception."):
+            r.evaluate_array([1.0, 0.0, 2.0], 0.0, 0.0)
+
     def test_negate(self):
         v = [-1e10, -7, -0.001, 0.0, 0.00003, 10, 2.3e49]
         r = -self.f1
@@ -0,0 +1,185 @@
+# Copyright (c) 2014-2020, Dr Alex Meakins, Raysect Project
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#     1. Redistributions of source code must retain the above copyright notice,
+#        this list of conditions and the following disclaimer.
+#
+#     2. Redistributions in binary form must reproduce the above copyright
+#        notice, this list of conditions and the following disclaimer in the
+#        documentation and/or other materials provided with the distribution.
+#
+#     3. Neither the name of the Raysect Project nor the names of its
+#        contributors may be used to endorse or promote products derived from
+#        this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Unit tests for the CompiledFunction3D class.
+"""
+
+import math
+import pickle
+import unittest
+import numpy as np
+from raysect.core.math.function.float.function3d import Arg3D, Constant3D, Exp3D, Sin3D, Sqrt3D, Atan4Q3D, Erf3D
+from raysect.core.math.function.float.function3d.autowrap import PythonFunction3D
+from raysect.core.math.function.float.function3d.compiled import CompiledFunction3D, compile_function3d
+
+
+class TestCompiledFunction3D(unittest.TestCase):
+
+    def setUp(self):
+
+        self.x = Arg3D('x')
+        self.y = Arg3D('y')
+        self.z = Arg3D('z')
+        self.points = [(x, y, z) for x in (-2.5, -0.3, 0.0, 0.7, 3.1) for y in (-1.1, 0.2, 2.0) for z in (-0.5, 0.0, 1.5)]
+
+    def assert_equivalent(self, function, compiled=None):
+        compiled = compiled or compile_function3d(function)
+        for point in self.points:
+            self.assertAlmostEqual(compiled(*point), function(*point), places=12,
+                                   msg="Compiled function did not match the reference function at {}.".format(point))
+        return compiled
+
+    def test_arithmetic(self):
+        x, y, z = self.x, self.y, self.z
+        functions = [
+            x + y * z - 3,
+            2 - x / (y + 10),
+            (x * y) % 1.3,
+            4.1 % (abs(y) + 1),
+            abs(x - z) ** 0.5,
+            2 ** x,
+            (x + 3) ** (y + 2),
+            -x + 7 / (z + 10),
+        ]
+        for function in functions:
+            self.assert_equivalent(function)
+
+    def test_comparisons(self):
+        x, y = self.x, self.y
+        functions = [x == y, x != y, x < y, x > y, x <= y, x >= y, 0.7 == x, 0.0 != y, 1 < x, 1 > x, 0 <= y, 0 >= y]
+        for function in functions:
+            self.assert_equivalent(function)
+
+    def test_cmath(self):
+        x, y, z = self.x, self.y, self.z
+        functions = [
+            Exp3D(-(x**2 + y**2)) * Sin3D(z),
+            Sqrt3D(x*x + y*y + z*z),
+            Atan4Q3D(y, x),
+            Erf3D(x - z),
+        ]
+        for function in functions:
+            self.assert_equivalent(function)
+
+    def test_python_function(self):
+        f = PythonFunction3D(lambda x, y, z: x * y - z)
+        function = 2 * f + f * f
+        compiled = self.assert_equivalent(function)
+
+        # the wrapped function is only called once per evaluation
+        self.assertEqual(compiled.instruction_count, 4)
+
+    def test_constant_folding(self):
+        x = self.x
+        function = Constant3D(2) * Constant3D(3) + 4 ** Constant3D(0.5)
+        compiled = self.assert_equivalent(function)
+        self.assertEqual(compiled.instruction_count, 0)
+        self.assertEqual(compiled(1, 2, 3), 8.0)
+
+        function = (x + 0) * 1 / 1 - 0
+        compiled = self.assert_equivalent(function)
+        self.assertEqual(compiled.instruction_count, 0)
+
+    def test_common_subexpressions(self):
+        x, y = self.x, self.y
+
+        # structurally identical, but separate, nodes are merged
+        function = Exp3D(-(x * y)) + Exp3D(-(y * x))
+        compiled = self.assert_equivalent(function)
+        self.assertEqual(compiled.instruction_count, 4)
+
+    def test_errors(self):
+        x, y = self.x, self.y
+
+        # errors are raised when evaluated, not when folded during compilation
+        compiled = compile_function3d(x / (y - y))
+        with self.assertRaises(ZeroDivisionError):
+            compiled(1, 2, 3)
+
+        compiled = compile_function3d(x + 1 / Constant3D(0))
+        with self.assertRaises(ZeroDivisionError):
+            compiled(1, 2, 3)
+
+        compiled = compile_function3d(Sqrt3D(x))
+        with self.assertRaises(ValueError):
+            compiled(-1, 0, 0)
+
+        compiled = compile_function3d(x ** 0.5)
+        with self.assertRaises(ValueError):
+            compiled(-1, 0, 0)
+
+    def test_nested(self):
+        x, y = self.x, self.y
+        inner = compile_function3d(x * y + 1)
+        function = inner * inner + x
+        self.assertIsInstance(compile_function3d(function), CompiledFunction3D)
+        self.assert_equivalent(function)
+
+    def test_reentrant(self):
+
+        # a called function that evaluates the compiled function must not corrupt its registers
+        compiled = None
+
+        def recurse(x, y, z):
+            return compiled(x / 2, y, z) if abs(x) > 1 else x
+
+        function = self.x * self.y + PythonFunction3D(recurse)
+        compiled = compile_function3d(function)
+        self.assert_equivalent(function, compiled)
+
+    def test_deep_expression(self):
+        function = self.x
+        for i in range(5000):
+            function = function + i * self.y
+        compiled = compile_function3d(function)
+        self.assertAlmostEqual(compiled(1, 2, 3), function(1, 2, 3), delta=1e-6)
+
+    def test_evaluate_array(self):
+        x, y, z = self.x, self.y, self.z
+        function = Exp3D(-(x**2 + y**2)) + z
+        compiled = compile_function3d(function)
+        grid = np.linspace(-1, 1, 5)
+        np.testing.assert_allclose(
+            compiled.evaluate_array(grid, grid, grid),
+            function.evaluate_array(grid, grid, grid),
+            rtol=1e-14
+        )
+
+    def test_pickle(self):
+        x, y, z = self.x, self.y, self.z
+        function = 2 * Exp3D(-(x**2 + y**2)) + Sin3D(z) * 3
+        compiled = pickle.loads(pickle.dumps(compile_function3d(function)))
+        self.assertIsInstance(compiled, CompiledFunction3D)
+        self.assertEqual(compiled.instruction_count, compile_function3d(function).instruction_count)
+        self.assert_equivalent(function, compiled)
+
+
+if __name__ == "__main__":
+    unittest.main()